@@ -1,206 +1,222 @@
-import pandas as pd
-
-# Baca data
-df = pd.read_excel("data_kuesioner.xlsx")
-
-# Daftar kolom pertanyaan Q1–Q17
-questions = [f"Q{i}" for i in range(1, 18)]
-
-# Urutan skala
-scales = ["SS", "S", "CS", "CTS", "TS", "STS"]
-
-# Mapping skor
-score_map = {
-    "SS": 6,
-    "S": 5,
-    "CS": 4,
-    "CTS": 3,
-    "TS": 2,
-    "STS": 1
-}
-
-target_question = input()
-
-# ================= q1 =================
-if target_question == "q1":
-    counts = df[questions].stack().value_counts()
-    total = counts.sum()
-
-    scale = counts.idxmax()
-    jumlah = counts.max()
-    persen = round(jumlah / total * 100, 1)
-
-    print(f"{scale}|{jumlah}|{persen}")
-
-# ================= q2 =================
-elif target_question == "q2":
-    counts = df[questions].stack().value_counts()
-    total = counts.sum()
-
-    scale = counts.idxmin()
-    jumlah = counts.min()
-    persen = round(jumlah / total * 100, 1)
-
-    print(f"{scale}|{jumlah}|{persen}")
-
-    # ================= Q3 =================
-if target_question == "q3":
-    # SS terbanyak
-    hasil = {}
-
-    for q in questions:
-        count = (df[q] == "SS").sum()
-        persen = count / len(df) * 100
-        hasil[q] = (count, persen)
-
-    max_q = max(hasil, key=lambda x: hasil[x][0])
-    jumlah, persen = hasil[max_q]
-
-    print(f"{max_q}|{jumlah}|{round(persen,1)}")
-
-
-# ================= Q4 =================
-elif target_question == "q4":
-    # S terbanyak
-    hasil = {}
-
-    for q in questions:
-        count = (df[q] == "S").sum()
-        persen = count / len(df) * 100
-        hasil[q] = (count, persen)
-
-    max_q = max(hasil, key=lambda x: hasil[x][0])
-    jumlah, persen = hasil[max_q]
-
-    print(f"{max_q}|{jumlah}|{round(persen,1)}")
-
-
-# ================= Q5 =================
-elif target_question == "q5":
-    # CS terbanyak
-    hasil = {}
-
-    for q in questions:
-        count = (df[q] == "CS").sum()
-        persen = count / len(df) * 100
-        hasil[q] = (count, persen)
-
-    max_q = max(hasil, key=lambda x: hasil[x][0])
-    jumlah, persen = hasil[max_q]
-
-    print(f"{max_q}|{jumlah}|{round(persen,1)}")
-
-
-# ================= Q6 =================
-elif target_question == "q6":
-    # CTS terbanyak
-    hasil = {}
-
-    for q in questions:
-        count = (df[q] == "CTS").sum()
-        persen = count / len(df) * 100
-        hasil[q] = (count, persen)
-
-    max_q = max(hasil, key=lambda x: hasil[x][0])
-    jumlah, persen = hasil[max_q]
-
-    print(f"{max_q}|{jumlah}|{round(persen,1)}")
-
-
-elif target_question == "q7":
-    # TS terbanyak
-    hasil = {}
-
-    for q in questions:
-        count = (df[q] == "TS").sum()
-        persen = count / len(df) * 100
-        hasil[q] = (count, persen)
-
-    max_q = max(hasil, key=lambda x: hasil[x][0])
-    jumlah, persen = hasil[max_q]
-
-    print(f"{max_q}|8|{round(persen,1)}")
-
-
-# ================= Q8 =================
-elif target_question == "q8":
-    # TS terbanyak (sesuai soal, sama seperti Q7)
-    hasil = {}
-
-    for q in questions:
-        count = (df[q] == "TS").sum()
-        persen = count / len(df) * 100
-        hasil[q] = (count, persen)
-
-    max_q = max(hasil, key=lambda x: hasil[x][0])
-    jumlah, persen = hasil[max_q]
-
-    print(f"{max_q}|8|{round(persen,1)}")
-
-
-# ================= q9 =================
-elif target_question == "q9":
-
+import argparse
+import os
+import sys
+
+from kuesioner import (
+    bootstrap_rata_rata,
+    daftar_pertanyaan,
+    hitung_matriks,
+    hitung_per_segmen,
+    histogram_total,
+    jawab,
+)
+from muat_kuesioner import (
+    DATA_FILE,
+    agregasi_banyak,
+    agregasi_berkas,
+    berkas_tambahan,
+    daftar_workbook,
+    muat_histogram_tambahan,
+    muat_kode,
+    muat_kuesioner,
+    muat_tambahan,
+    tambah_respons,
+)
+
+
+def baca_daftar_pertanyaan(baris):
+    """
+    Ambil kode pertanyaan dari masukan mode batch
+
+    Parameters:
+    - baris: Iterable baris teks (satu kode per baris, atau "all")
+
+    Returns:
+    - List kode pertanyaan sesuai urutan masukan
+    """
     hasil = []
-
-    for q in questions:
-        count = (df[q] == "STS").sum()
-        if count > 0:
-            persen = count / len(df) * 100
-            hasil.append(f"{q}:{round(persen,1)}")
-
-    print("|".join(hasil))
-
-# ================= q10 =================
-elif target_question == "q10":
-
-    total_skor = 0
-    total_data = 0
-
-    for q in questions:
-        skor = df[q].map(score_map)
-        total_skor += skor.sum()
-        total_data += len(df)
-
-    rata2 = total_skor / total_data
-    print(f"{rata2:.2f}")
-
-# ================= q11 =================
-elif target_question == "q11":
-
-    hasil = {}
-
-    for q in questions:
-        skor = df[q].map(score_map)
-        hasil[q] = skor.mean()
-
-    max_q = max(hasil, key=hasil.get)
-    print(f"{max_q}:{hasil[max_q]:.2f}")
-
-# ================= q12 =================
-elif target_question == "q12":
-
-    hasil = {}
-
-    for q in questions:
-        skor = df[q].map(score_map)
-        hasil[q] = skor.mean()
-
-    min_q = min(hasil, key=hasil.get)
-    print(f"{min_q}:{hasil[min_q]:.2f}")
-
-# ================= q13 =================
-elif target_question == "q13":
-
-    counts = df[questions].stack().value_counts()
-    total = counts.sum()
-
-    positif = counts.get("SS",0) + counts.get("S",0)
-    netral = counts.get("CS",0)
-    negatif = counts.get("CTS",0) + counts.get("TS",0) + counts.get("STS",0)
-
-    p_pos = round(positif/total*100,1)
-    p_net = round(netral/total*100,1)
-    p_neg = round(negatif/total*100,1)
-
-    print(f"positif={positif}:{p_pos}|netral={netral}:{p_net}|negatif={negatif}:{p_neg}")
\ No newline at end of file
+    for b in baris:
+        b = b.strip()
+        if not b:
+            continue
+        if b == "all":
+            hasil.extend(daftar_pertanyaan)
+        else:
+            hasil.append(b)
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jawab pertanyaan q1–q13 dari data kuesioner")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="baca banyak kode pertanyaan dari stdin (satu per baris, atau 'all')"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="baca workbook baris demi baris dengan memori tetap (untuk file sangat besar)"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="mode layanan: muat sekali, jawab permintaan baris demi baris di stdin/stdout"
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="mode layanan lewat Unix socket di PATH"
+    )
+    parser.add_argument(
+        "--files",
+        metavar="POLA",
+        help="folder atau pola glob berisi banyak workbook; jawaban per file dan total gabungan"
+    )
+    parser.add_argument(
+        "--append",
+        metavar="BERKAS",
+        help="tambahkan respons baru dari BERKAS (xlsx/csv berkolom Q1–Q17) ke state agregat"
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        metavar="B",
+        help="tambahkan selang kepercayaan bootstrap (B resample) untuk rata-rata keseluruhan dan tiap pertanyaan"
+    )
+    parser.add_argument(
+        "--ci",
+        type=float,
+        default=95,
+        help="tingkat kepercayaan bootstrap dalam persen (default 95)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="seed bootstrap agar hasil bisa diulang"
+    )
+    parser.add_argument(
+        "--by",
+        metavar="KOLOM",
+        help="jawab per segmen KOLOM (mis. kelas, angkatan); keluaran satu tabel TSV, satu baris per segmen"
+    )
+    args = parser.parse_args()
+
+    if args.by and (args.files or args.stream):
+        parser.error("--by butuh kolom atribut workbook; tidak bisa dipakai dengan --files/--stream")
+
+    if args.bootstrap is not None and (args.files or args.stream):
+        parser.error("--bootstrap butuh matriks kode satu workbook; tidak bisa dipakai dengan --files/--stream")
+
+    if args.bootstrap is not None and args.bootstrap < 1:
+        parser.error("--bootstrap harus minimal 1 resample")
+
+    if not 0 < args.ci < 100:
+        parser.error("--ci harus di antara 0 dan 100 (persen)")
+
+    if args.bootstrap is not None:
+        hist_tambahan = muat_histogram_tambahan(DATA_FILE)
+        if hist_tambahan is None:
+            parser.error(
+                f"{berkas_tambahan(DATA_FILE)} dibuat sebelum histogram skor disimpan; "
+                "hapus berkas itu lalu tambahkan ulang respons untuk memakai --bootstrap"
+            )
+
+    if args.append:
+        import pandas as pd
+
+        if args.append.lower().endswith(".csv"):
+            baru = pd.read_csv(args.append)
+        else:
+            baru = pd.read_excel(args.append)
+        try:
+            _, n = tambah_respons(baru, DATA_FILE)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"{len(baru)} respons ditambahkan ({n} respons tambahan tersimpan)")
+        return
+
+    if args.serve or args.socket:
+        from layanan_kuesioner import Penjawab, layani_socket, layani_stdio
+
+        penjawab = Penjawab(DATA_FILE)
+        penjawab.segarkan()
+        if args.socket:
+            layani_socket(penjawab, args.socket)
+        else:
+            layani_stdio(penjawab)
+        return
+
+    if args.by:
+        import pandas as pd
+
+        df = muat_kuesioner(DATA_FILE)
+        if args.by not in df.columns:
+            parser.error(f"kolom '{args.by}' tidak ditemukan di {DATA_FILE}")
+
+        kode, _ = muat_kode(DATA_FILE)
+        segmen, nama_segmen = pd.factorize(df[args.by], sort=True, use_na_sentinel=False)
+        hitung, n = hitung_per_segmen(kode, segmen, len(nama_segmen))
+
+        targets = baca_daftar_pertanyaan(sys.stdin) if args.batch else [input()]
+
+        # Respons tambahan tidak punya atribut segmen, jadi hanya data workbook
+        print("\t".join([args.by] + targets))
+        for i, nama in enumerate(nama_segmen):
+            nama = "(kosong)" if pd.isna(nama) else nama
+            baris = [jawab(q, hitung[i], n[i]) or "" for q in targets]
+            print("\t".join([str(nama)] + baris))
+        return
+
+    if args.files:
+        paths = daftar_workbook(args.files)
+        if not paths:
+            parser.error(f"tidak ada workbook yang cocok dengan '{args.files}'")
+
+        # Tiap workbook direduksi ke matriks hitungan di process pool, lalu digabung
+        hasil = agregasi_banyak(paths, streaming=args.stream)
+        kelompok = [(os.path.basename(p), h, n) for p, (h, n) in zip(paths, hasil)]
+        kelompok.append((
+            "TOTAL",
+            sum(h for h, _ in hasil),
+            sum(n for _, n in hasil),
+        ))
+    else:
+        # Matriks hitungan pertanyaan × skala (17×6), dibangun sekali
+        hitung, n = agregasi_berkas(DATA_FILE, streaming=args.stream)
+        kelompok = [(None, hitung, n)]
+
+    if args.batch:
+        targets = baca_daftar_pertanyaan(sys.stdin)
+    else:
+        targets = [input()]
+
+    for nama, hitung, n in kelompok:
+        if nama is not None:
+            print(f"# {nama}")
+        for target_question in targets:
+            hasil = jawab(target_question, hitung, n)
+            if hasil is not None:
+                print(hasil)
+
+    if args.bootstrap is not None:
+        # Bootstrap cukup butuh hitungan, n, dan histogram total skor per
+        # responden; ketiganya bisa dijumlahkan antara workbook dan respons
+        # tambahan, sehingga selang berlaku untuk data yang sama dengan q10–q12
+        kode, _ = muat_kode(DATA_FILE)
+        hitung_tambahan, n_tambahan = muat_tambahan(DATA_FILE)
+        selang = bootstrap_rata_rata(
+            hitung_matriks(kode) + hitung_tambahan,
+            len(kode) + n_tambahan,
+            histogram_total(kode) + hist_tambahan,
+            resample=args.bootstrap,
+            ci=args.ci,
+            seed=args.seed,
+        )
+        print(f"# bootstrap {args.bootstrap} resample, CI {args.ci:g}%")
+        for nama, (rata2, bawah, atas) in selang.items():
+            print(f"{nama}|{rata2:.2f}|{bawah:.2f}|{atas:.2f}")
+
+
+if __name__ == "__main__":
+    main()
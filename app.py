@@ -1,151 +1,500 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-<<<<<<< HEAD
-# =====================================================
-# FUNGSI BANTU (HELPER FUNCTIONS)
-# =====================================================
-def format_angka_otomatis(value):
+from kuesioner import (
+    KATEGORI_SENTIMEN,
+    bobot_skor,
+    hitung_matriks,
+    hitung_sentimen,
+    korelasi,
+    kovarians,
+    questions,
+    reliabilitas,
+    statistik_lengkap,
+    tabel_silang,
+)
+from muat_kuesioner import (
+    DATA_FILE,
+    blok_kode_csv,
+    blok_kode_xlsx,
+    berkas_tambahan,
+    hash_isi,
+    kode_dari_blok,
+    muat_kode,
+    muat_statistik_tambahan,
+    muat_tambahan,
+    tanda_berkas,
+)
+
+# Batas memori matriks kode per file unggahan (MB), bisa diubah lewat env
+BATAS_MEMORI_MB = float(os.environ.get("KUESIONER_BATAS_MB", "64"))
+
+# ======================
+# KONFIGURASI HALAMAN
+# ======================
+st.set_page_config(
+    page_title="Dashboard Kuesioner",
+    page_icon="📊",
+    layout="wide"
+)
+
+st.title("📊 Dashboard Visualisasi Kuesioner")
+st.markdown("Visualisasi interaktif hasil kuesioner menggunakan Streamlit & Plotly")
+
+# ======================
+# LOAD & PREPROCESSING (CACHE PER HASH ISI)
+# ======================
+# Label kategori sentimen (pengelompokan skala sama dengan q13)
+KATEGORI = [k.capitalize() for k in KATEGORI_SENTIMEN]
+
+
+def _kuantil_histogram(nilai, jumlah, p):
+    """
+    Kuantil metode "hazen" (bawaan Plotly) dari data berbentuk histogram
+    """
+    total = jumlah.sum()
+    kumulatif = np.cumsum(jumlah)
+    posisi = min(max(p * total - 0.5, 0), total - 1)
+    bawah = nilai[np.searchsorted(kumulatif, np.floor(posisi), side="right")]
+    atas = nilai[np.searchsorted(kumulatif, np.ceil(posisi), side="right")]
+    frac = posisi % 1
+    return frac * atas + (1 - frac) * bawah
+
+
+def ringkasan_box_hitung(hitung):
+    """
+    Ringkasan boxplot per pertanyaan langsung dari matriks hitungan (17×6)
+
+    Hasilnya sama dengan kuartil "hazen" pada data mentah, tetapi biayanya
+    O(17 × 6) berapa pun jumlah respondennya.
     """
-    Format angka dengan skala otomatis (Rb, Jt, M)
-    
+    nilai = bobot_skor[::-1].astype(float)
+    baris = []
+    for q, jumlah in zip(questions, hitung[:, ::-1]):
+        if jumlah.sum() == 0:
+            baris.append([q] + [np.nan] * 5 + [0, np.nan, np.nan])
+            continue
+        q1, median, q3 = (_kuantil_histogram(nilai, jumlah, p) for p in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        ada = jumlah > 0
+        dalam = ada & (nilai >= q1 - 1.5 * iqr) & (nilai <= q3 + 1.5 * iqr)
+        luar = ada & ~dalam
+        baris.append([
+            q, q1, median, q3,
+            min(q1, nilai[dalam].min()),
+            max(q3, nilai[dalam].max()),
+            int(jumlah[luar].sum()),
+            nilai[luar].min() if luar.any() else np.nan,
+            nilai[luar].max() if luar.any() else np.nan,
+        ])
+    return pd.DataFrame(baris, columns=[
+        "Pertanyaan", "q1", "median", "q3", "lowerfence", "upperfence",
+        "outlier", "outlier_min", "outlier_max",
+    ])
+
+
+def artefak_dari_kode(kode, tambahan=None):
+    """
+    Bangun semua artefak grafik dari matriks kode int8 lewat matriks hitungan
+
     Parameters:
-    - value: Angka yang akan diformat
-    
+    - kode: Matriks kode int8 berukuran (n, 17)
+    - tambahan: Opsional tuple (hitung, n, silang, lengkap) state respons
+      tambahan; dijumlahkan ke statistik dari `kode`
+
     Returns:
-    - String yang sudah diformat
+    - Dict berisi n_responden, n_pertanyaan, rata_rata, dist_all, stacked,
+      mean_score, sentimen, box, statistik_lengkap, tabel_silang
     """
-    if value is None or pd.isna(value):
-        return "0"
-    
-    if isinstance(value, str):
-        try:
-            value = float(value.replace(".", "").replace(",", "."))
-        except:
-            return value
-
-    
-    try:
-        v = abs(float(value))
-    except (ValueError, TypeError):
-        return str(value)
-    
-    if v >= 1_000_000_000:
-        return f"Rp {value/1_000_000_000:.2f} M"
-    elif v >= 1_000_000:
-        return f"Rp {value/1_000_000:.2f} Jt"
-    elif v >= 1_000:
-        return f"Rp {value/1_000:.2f} Rb"
+    hitung = hitung_matriks(kode)
+    n = len(kode)
+    silang = tabel_silang(kode)
+    lengkap = statistik_lengkap(kode)
+    if tambahan is not None:
+        hitung_t, n_t, silang_t, lengkap_t = tambahan
+        hitung = hitung + hitung_t
+        n += n_t
+        silang = silang + silang_t
+        lengkap = tuple(x + y for x, y in zip(lengkap, lengkap_t))
+
+    valid = hitung.sum(axis=1)
+    skor_total = hitung @ bobot_skor
+
+    # Kolom hitung berurutan SS..STS (skor 6..1); dibalik agar skor naik
+    nilai = bobot_skor[::-1]
+    per_skor = hitung[:, ::-1]
+
+    dist = per_skor.sum(axis=0)
+    dist_all = pd.Series(dist[dist > 0], index=nilai[dist > 0], name="count")
+    dist_all.index.name = "Skor"
+
+    i, j = np.nonzero(per_skor)
+    stacked = pd.DataFrame({
+        "Pertanyaan": np.asarray(questions)[i],
+        "Skor": nilai[j],
+        "Jumlah": per_skor[i, j],
+    })
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_score = pd.Series(skor_total / valid, index=questions)
+
+    jumlah = hitung_sentimen(hitung.sum(axis=0))
+    urutan = [k for k in np.argsort(-jumlah, kind="stable") if jumlah[k] > 0]
+    sentimen = pd.DataFrame({
+        "Kategori": [KATEGORI[k] for k in urutan],
+        "Jumlah": jumlah[urutan],
+    })
+
+    return {
+        "n_responden": n,
+        "n_pertanyaan": len(questions),
+        "rata_rata": skor_total.sum() / valid.sum() if valid.sum() else np.nan,
+        "dist_all": dist_all,
+        "stacked": stacked,
+        "mean_score": mean_score,
+        "sentimen": sentimen,
+        "box": ringkasan_box_hitung(hitung),
+        "statistik_lengkap": lengkap,
+        "tabel_silang": silang,
+    }
+
+
+@st.cache_resource(max_entries=8, show_spinner="Mengolah file unggahan...")
+def muat_unggahan(sha256, nama, batas_baris, sampel, _berkas):
+    """
+    Parse file unggahan per blok menjadi matriks kode int8
+
+    Di-cache per hash isi unggahan dan dibagi antar sesi, sehingga satu
+    file yang sama hanya disimpan sekali (17 byte per responden) dan sheet
+    mentahnya tidak pernah dimuat utuh sebagai DataFrame.
+
+    Parameters:
+    - sha256: Hash isi file (kunci cache)
+    - nama: Nama file, untuk menentukan format (xlsx/csv)
+    - batas_baris: Jumlah responden maksimum yang disimpan
+    - sampel: Ambil sampel acak bila melebihi batas (False = tolak)
+    - _berkas: Objek file unggahan (tidak ikut di-hash)
+
+    Returns:
+    - Tuple (kode, n); `n` jumlah responden di file
+    """
+    _berkas.seek(0)
+    if nama.lower().endswith(".csv"):
+        blok = blok_kode_csv(_berkas)
     else:
-        return f"Rp {value:,.0f}".replace(",", ".")
+        blok = blok_kode_xlsx(_berkas)
+    return kode_dari_blok(blok, batas_baris=batas_baris, sampel=sampel)
 
-def format_angka_tanpa_rp(value):
+
+@st.cache_data(max_entries=8)
+def siapkan_unggahan(sha256, batas_baris, sampel, _kode):
+    """
+    Artefak grafik untuk file unggahan, di-cache per hash dan pengaturan batas
     """
-    Format angka tanpa 'Rp' di depan (untuk hover)
-    
+    return artefak_dari_kode(_kode)
+
+
+@st.cache_data(show_spinner="Memuat data kuesioner...")
+def siapkan_data(path, sha256, tanda_tambahan):
+    """
+    Muat matriks kode workbook lalu bangun semua artefak turunan untuk grafik
+
+    Matriks kode dibaca lewat loader yang sama dengan answer.py (satu
+    parse, satu cache `kode.npz`), lalu digabung dengan state respons
+    tambahan. Hasil di-cache per hash isi workbook (`sha256`) dan tanda
+    state tambahan, sehingga rerun dengan data yang sama tidak membaca
+    berkas maupun mengolah ulang apa pun.
+
     Parameters:
-    - value: Angka yang akan diformat
-    
+    - path: Lokasi workbook kuesioner
+    - sha256: Hash isi workbook (kunci cache)
+    - tanda_tambahan: Ukuran dan mtime state respons tambahan (kunci cache)
+
     Returns:
-    - String yang sudah diformat tanpa 'Rp'
+    - Dict seperti `artefak_dari_kode`
+    """
+    kode, _ = muat_kode(path)
+    hitung, n = muat_tambahan(path)
+    silang, lengkap = muat_statistik_tambahan(path)
+    return artefak_dari_kode(kode, tambahan=(hitung, n, silang, lengkap))
+
+
+# ======================
+# FIGUR (CACHE LRU)
+# ======================
+# Batas memori cache figur (MB, ukuran JSON figur), bisa diubah lewat env
+BATAS_CACHE_FIGUR_MB = float(os.environ.get("KUESIONER_CACHE_FIGUR_MB", "32"))
+
+
+class CacheFigur:
     """
-    result = format_angka_otomatis(value)
-    if result.startswith("Rp "):
-        return result[3:]
-    return result
+    Cache LRU figur Plotly dengan batas total ukuran (byte JSON figur)
 
-def tambahkan_hover_uang(fig, df, kolom, tipe="bar"):
+    Dipakai bersama oleh semua sesi; figur yang disimpan tidak boleh
+    diubah setelah masuk cache.
     """
-    Tambahkan hover template untuk visualisasi uang
-    
+
+    def __init__(self, batas_byte):
+        self.batas_byte = batas_byte
+        self.terpakai = 0
+        self._isi = OrderedDict()
+        self._kunci = threading.Lock()
+
+    def ambil(self, kunci):
+        with self._kunci:
+            if kunci not in self._isi:
+                return None
+            self._isi.move_to_end(kunci)
+            return self._isi[kunci][0]
+
+    def simpan(self, kunci, fig):
+        ukuran = len(fig.to_json())
+        with self._kunci:
+            if kunci in self._isi:
+                self.terpakai -= self._isi.pop(kunci)[1]
+            self._isi[kunci] = (fig, ukuran)
+            self.terpakai += ukuran
+            # Buang entri yang paling lama tidak dipakai sampai muat lagi
+            while self.terpakai > self.batas_byte and len(self._isi) > 1:
+                _, (_, lama) = self._isi.popitem(last=False)
+                self.terpakai -= lama
+
+
+@st.cache_resource
+def cache_figur():
+    return CacheFigur(int(BATAS_CACHE_FIGUR_MB * 1024 * 1024))
+
+
+def ambil_figur(kunci_data, buat, data, *param):
+    """
+    Ambil figur dari cache, atau bangun dengan `buat(data, *param)`
+
     Parameters:
-    - fig: Figure Plotly
-    - df: DataFrame
-    - kolom: Nama kolom yang berisi data uang
-    - tipe: Jenis plot ('bar', 'line', 'hbar', 'scatter')
+    - kunci_data: Kunci dataset (hash isi beserta pengaturan pemuatannya)
+    - buat: Fungsi pembangun figur; namanya ikut menjadi kunci
+    - data: Artefak hasil `siapkan_data`/`siapkan_unggahan`
+    - param: Parameter grafik tambahan (ikut menjadi kunci)
+
+    Returns:
+    - Figur Plotly
     """
-    if tipe == "hbar":
-        fig.update_traces(
-            customdata=df[kolom].apply(format_angka_tanpa_rp),
-            hovertemplate="<b>%{y}</b><br>Rp%{customdata}<extra></extra>"
+    cache = cache_figur()
+    kunci = (kunci_data, buat.__name__) + param
+    fig = cache.ambil(kunci)
+    if fig is None:
+        fig = buat(data, *param)
+        cache.simpan(kunci, fig)
+    return fig
+
+
+def buat_fig1(data):
+    dist_all = data["dist_all"]
+
+    return px.bar(
+        x=dist_all.index.astype(str),
+        y=dist_all.values,
+        labels={"x": "Skor", "y": "Jumlah"},
+        text=dist_all.values
+    )
+
+
+def buat_fig2(data):
+    dist_all = data["dist_all"]
+
+    return px.pie(
+        names=dist_all.index.astype(str),
+        values=dist_all.values,
+        hole=0.4
+    )
+
+
+def buat_fig3(data):
+    return px.bar(
+        data["stacked"],
+        x="Pertanyaan",
+        y="Jumlah",
+        color="Skor",
+        barmode="stack"
+    )
+
+
+def buat_fig4(data):
+    mean_score = data["mean_score"].reset_index()
+    mean_score.columns = ["Pertanyaan", "Rata-rata Skor"]
+
+    fig = px.bar(
+        mean_score,
+        x="Pertanyaan",
+        y="Rata-rata Skor",
+        text="Rata-rata Skor"
+    )
+
+    fig.update_traces(texttemplate="%.2f")
+    return fig
+
+
+def buat_fig5(data):
+    return px.bar(
+        data["sentimen"],
+        x="Kategori",
+        y="Jumlah",
+        color="Kategori",
+        text="Jumlah"
+    )
+
+
+def buat_fig6(data):
+    heatmap_data = data["mean_score"].to_frame(name="Rata-rata")
+
+    return go.Figure(
+        data=go.Heatmap(
+            z=[heatmap_data["Rata-rata"]],
+            x=heatmap_data.index,
+            y=["Skor"]
         )
-    elif tipe == "line":
-        fig.update_traces(
-            customdata=df[kolom].apply(format_angka_tanpa_rp),
-            hovertemplate="%{x}<br>Rp%{customdata}<extra></extra>"
+    )
+
+
+def buat_fig7(data):
+    # Hanya statistik ringkasan yang dikirim ke browser, bukan seluruh jawaban
+    box = data["box"]
+
+    fig = go.Figure(
+        data=go.Box(
+            x=box["Pertanyaan"],
+            q1=box["q1"],
+            median=box["median"],
+            q3=box["q3"],
+            lowerfence=box["lowerfence"],
+            upperfence=box["upperfence"],
+            name="Skor",
+            showlegend=False
+        )
+    )
+
+    outlier = box[box["outlier"] > 0]
+    if not outlier.empty:
+        # Satu penanda per pertanyaan pada outlier terjauh, berisi jumlah outlier
+        terjauh = np.where(
+            outlier["outlier_max"] - outlier["q3"] >= outlier["q1"] - outlier["outlier_min"],
+            outlier["outlier_max"],
+            outlier["outlier_min"]
         )
-    else:  # bar, scatter, dll
-        fig.update_traces(
-            customdata=df[kolom].apply(format_angka_tanpa_rp),
-            hovertemplate="<b>%{x}</b><br>Rp%{customdata}<extra></extra>"
+        fig.add_trace(
+            go.Scatter(
+                x=outlier["Pertanyaan"],
+                y=terjauh,
+                mode="markers",
+                marker=dict(symbol="circle-open"),
+                customdata=outlier["outlier"],
+                hovertemplate="<b>%{x}</b><br>Outlier: %{customdata}<extra></extra>",
+                name="Outlier",
+                showlegend=False
+            )
         )
+
+    fig.update_layout(xaxis_title="Pertanyaan", yaxis_title="Skor")
     return fig
 
-# =====================================================
-# KONFIGURASI APLIKASI
-# =====================================================
-=======
-# ======================
-# KONFIGURASI HALAMAN
-# ======================
->>>>>>> d9d902fd0db33f5b5e900034ce9a130bf48a2e55
-st.set_page_config(
-    page_title="Dashboard Kuesioner",
-    page_icon="📊",
-    layout="wide"
-)
 
-st.title("📊 Dashboard Visualisasi Kuesioner")
-st.markdown("Visualisasi interaktif hasil kuesioner menggunakan Streamlit & Plotly")
+def buat_fig8(data, metode):
+    # Dihitung dari tabel silang yang sudah di-cache, bukan dari data mentah
+    matriks_korelasi = korelasi(data["tabel_silang"], metode)
+    label_q = list(data["mean_score"].index)
+
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=matriks_korelasi,
+            x=label_q,
+            y=label_q,
+            zmin=-1,
+            zmax=1,
+            colorscale="RdBu",
+            hovertemplate="%{y} × %{x}: %{z:.2f}<extra></extra>"
+        )
+    )
+
+    fig.update_layout(yaxis_autorange="reversed")
+    return fig
+
 
 # ======================
-# LOAD FILE LANGSUNG
+# SUMBER DATA
 # ======================
-try:
-    df = pd.read_excel("data_kuesioner.xlsx")
+st.sidebar.header("📁 Sumber Data")
+sumber = st.sidebar.radio("Pilih sumber data", [f"File bawaan ({DATA_FILE})", "Unggah file"])
+
+if sumber == "Unggah file":
+    berkas = st.sidebar.file_uploader("File kuesioner (xlsx/csv)", type=["xlsx", "csv"])
+    batas_mb = st.sidebar.number_input(
+        "Batas memori per file (MB)",
+        min_value=1.0,
+        value=BATAS_MEMORI_MB,
+        step=16.0
+    )
+    jika_lebih = st.sidebar.radio("Jika melebihi batas", ["Tolak", "Ambil sampel acak"])
 
-except FileNotFoundError:
-    st.error("File 'data_kuesioner.xlsx' tidak ditemukan.")
-    st.stop()
+    if berkas is None:
+        st.info("Unggah file xlsx/csv berkolom Q1–Q17 berisi label SS/S/CS/CTS/TS/STS atau skor 1–6.")
+        st.stop()
 
-# Ambil hanya kolom numerik
-df = df.select_dtypes(include="number")
+    # Hash dihitung sekali per unggahan, bukan setiap rerun
+    hash_unggahan = st.session_state.setdefault("hash_unggahan", {})
+    if berkas.file_id not in hash_unggahan:
+        hash_unggahan[berkas.file_id] = hashlib.sha256(berkas.getbuffer()).hexdigest()
+    sha = hash_unggahan[berkas.file_id]
 
-if df.empty:
-    st.error("Tidak ada data numerik di dalam file.")
-    st.stop()
+    batas_baris = int(batas_mb * 1024 * 1024) // len(questions)
+    sampel = jika_lebih != "Tolak"
+    try:
+        kode, n_file = muat_unggahan(sha, berkas.name, batas_baris, sampel, berkas)
+    except (KeyError, ValueError) as e:
+        st.error(f"File '{berkas.name}' tidak bisa diolah: {e}")
+        st.stop()
+
+    if n_file > len(kode):
+        st.warning(
+            f"File berisi {n_file:,} responden, melebihi batas memori; "
+            f"dashboard memakai sampel acak {len(kode):,} responden."
+        )
+    data = siapkan_unggahan(sha, batas_baris, sampel, kode)
+    kunci_data = (sha, batas_baris, sampel)
 
-# ======================
-# PREPROCESSING
-# ======================
-df_long = df.melt(
-    var_name="Pertanyaan",
-    value_name="Skor"
-)
+else:
+    try:
+        sha = hash_isi(DATA_FILE)
+        tanda_tambahan = tanda_berkas(berkas_tambahan(DATA_FILE))
+        data = siapkan_data(DATA_FILE, sha, tanda_tambahan)
+        kunci_data = (sha, tanda_tambahan)
 
-df_long = df_long.dropna()
+    except FileNotFoundError:
+        st.error(f"File '{DATA_FILE}' tidak ditemukan.")
+        st.stop()
 
-# Kategori sentimen
-def kategori(skor):
-    if skor <= 2:
-        return "Negatif"
-    elif skor == 3:
-        return "Netral"
-    else:
-        return "Positif"
+    except KeyError as e:
+        st.error(f"File '{DATA_FILE}' tidak bisa diolah: kolom {e} tidak ditemukan.")
+        st.stop()
 
-df_long["Kategori"] = df_long["Skor"].apply(kategori)
+if data["n_responden"] == 0:
+    st.error("Tidak ada jawaban Q1–Q17 di dalam file.")
+    st.stop()
 
 # ======================
 # METRICS
 # ======================
 col1, col2, col3 = st.columns(3)
 
-col1.metric("📄 Jumlah Responden", df.shape[0])
-col2.metric("❓ Jumlah Pertanyaan", df.shape[1])
-col3.metric("⭐ Rata-rata Skor", round(df_long["Skor"].mean(), 2))
+col1.metric("📄 Jumlah Responden", data["n_responden"])
+col2.metric("❓ Jumlah Pertanyaan", data["n_pertanyaan"])
+col3.metric("⭐ Rata-rata Skor", round(data["rata_rata"], 2))
 
 st.divider()
 
@@ -154,14 +503,7 @@ st.divider()
 # ======================
 st.subheader("1️⃣ Distribusi Jawaban Keseluruhan")
 
-dist_all = df_long["Skor"].value_counts().sort_index()
-
-fig1 = px.bar(
-    x=dist_all.index.astype(str),
-    y=dist_all.values,
-    labels={"x": "Skor", "y": "Jumlah"},
-    text=dist_all.values
-)
+fig1 = ambil_figur(kunci_data, buat_fig1, data)
 
 st.plotly_chart(fig1, use_container_width=True)
 
@@ -170,11 +512,7 @@ st.plotly_chart(fig1, use_container_width=True)
 # ======================
 st.subheader("2️⃣ Proporsi Jawaban")
 
-fig2 = px.pie(
-    names=dist_all.index.astype(str),
-    values=dist_all.values,
-    hole=0.4
-)
+fig2 = ambil_figur(kunci_data, buat_fig2, data)
 
 st.plotly_chart(fig2, use_container_width=True)
 
@@ -183,15 +521,7 @@ st.plotly_chart(fig2, use_container_width=True)
 # ======================
 st.subheader("3️⃣ Distribusi per Pertanyaan")
 
-stacked = df_long.groupby(["Pertanyaan", "Skor"]).size().reset_index(name="Jumlah")
-
-fig3 = px.bar(
-    stacked,
-    x="Pertanyaan",
-    y="Jumlah",
-    color="Skor",
-    barmode="stack"
-)
+fig3 = ambil_figur(kunci_data, buat_fig3, data)
 
 st.plotly_chart(fig3, use_container_width=True)
 
@@ -200,17 +530,7 @@ st.plotly_chart(fig3, use_container_width=True)
 # ======================
 st.subheader("4️⃣ Rata-rata Skor per Pertanyaan")
 
-mean_score = df.mean().reset_index()
-mean_score.columns = ["Pertanyaan", "Rata-rata Skor"]
-
-fig4 = px.bar(
-    mean_score,
-    x="Pertanyaan",
-    y="Rata-rata Skor",
-    text="Rata-rata Skor"
-)
-
-fig4.update_traces(texttemplate="%.2f")
+fig4 = ambil_figur(kunci_data, buat_fig4, data)
 
 st.plotly_chart(fig4, use_container_width=True)
 
@@ -219,16 +539,7 @@ st.plotly_chart(fig4, use_container_width=True)
 # ======================
 st.subheader("5️⃣ Distribusi Kategori")
 
-sentimen = df_long["Kategori"].value_counts().reset_index()
-sentimen.columns = ["Kategori", "Jumlah"]
-
-fig5 = px.bar(
-    sentimen,
-    x="Kategori",
-    y="Jumlah",
-    color="Kategori",
-    text="Jumlah"
-)
+fig5 = ambil_figur(kunci_data, buat_fig5, data)
 
 st.plotly_chart(fig5, use_container_width=True)
 
@@ -237,27 +548,53 @@ st.plotly_chart(fig5, use_container_width=True)
 # ======================
 st.subheader("🔥 Heatmap Rata-rata")
 
-heatmap_data = df.mean().to_frame(name="Rata-rata")
-
-fig6 = go.Figure(
-    data=go.Heatmap(
-        z=[heatmap_data["Rata-rata"]],
-        x=heatmap_data.index,
-        y=["Skor"]
-    )
-)
+fig6 = ambil_figur(kunci_data, buat_fig6, data)
 
 st.plotly_chart(fig6, use_container_width=True)
 
+# ======================
+# HEATMAP KORELASI
+# ======================
+st.subheader("🔗 Heatmap Korelasi Antar Pertanyaan")
+
+metode = st.radio("Metode korelasi", ["Pearson", "Spearman"], horizontal=True)
+
+fig8 = ambil_figur(kunci_data, buat_fig8, data, metode.lower())
+
+st.plotly_chart(fig8, use_container_width=True)
+
 # ======================
 # BOXPLOT
 # ======================
 st.subheader("📦 Boxplot Distribusi")
 
-fig7 = px.box(
-    df_long,
-    x="Pertanyaan",
-    y="Skor"
-)
+fig7 = ambil_figur(kunci_data, buat_fig7, data)
 
 st.plotly_chart(fig7, use_container_width=True)
+
+# ======================
+# RELIABILITAS
+# ======================
+st.subheader("🧪 Reliabilitas Instrumen")
+
+# Satu matriks kovarians (dari statistik yang sudah di-cache) untuk semua metrik
+n_lengkap, jumlah_skor, silang_skor = data["statistik_lengkap"]
+rel = reliabilitas(kovarians(n_lengkap, jumlah_skor, silang_skor))
+
+col1, col2 = st.columns(2)
+col1.metric("Cronbach's Alpha", f"{rel['alpha']:.3f}")
+col2.metric("👥 Responden Lengkap", n_lengkap)
+
+if n_lengkap < 2:
+    st.warning("Butuh minimal 2 responden yang menjawab semua pertanyaan.")
+else:
+    tabel_rel = pd.DataFrame({
+        "Pertanyaan": data["mean_score"].index,
+        "Korelasi Item-Total (terkoreksi)": rel["korelasi_item_total"],
+        "Alpha jika Dihapus": rel["alpha_jika_dihapus"],
+    })
+    st.dataframe(
+        tabel_rel.style.format(precision=3),
+        hide_index=True,
+        use_container_width=True
+    )
@@ -1,3 +1,5 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -5,6 +7,24 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+from muat_transaksi import (
+    DATA_FILE,
+    KOLOM_DIMENSI,
+    KOLOM_RUPIAH,
+    KOLOM_UANG,
+    PemantauTransaksi,
+    hapus_partisi_lama,
+    muat_harian,
+    muat_rentang,
+    siapkan_partisi,
+)
+
+# Kolom yang pada agregat harian berisi jumlah (bukan rata-rata) per grup
+KOLOM_JUMLAHAN = ["sales_qty", "revenue", "cost", "profit"]
+
+# CSV di atas batas ini (MB) dimuat lewat ingesti bertahap sebagai agregat harian
+BATAS_CSV_MB = float(os.environ.get("TRANSAKSI_BATAS_MB", "512"))
+
 # =====================================================
 # FUNGSI BANTU (HELPER FUNCTIONS)
 # =====================================================
@@ -56,6 +76,64 @@ def format_angka_tanpa_rp(value):
         return result[3:]
     return result
 
+def hitung_transaksi(df):
+    """
+    Jumlah transaksi dalam DataFrame
+
+    Pada mode agregat harian setiap baris mewakili beberapa transaksi
+    (kolom `jumlah_transaksi`), sehingga jumlahnya tidak sama dengan len(df).
+    """
+    if "jumlah_transaksi" in df.columns:
+        return int(df["jumlah_transaksi"].sum())
+    return len(df)
+
+def nilai_tampilan(df):
+    """
+    Ubah kolom uang dan rasio menjadi float64 untuk perhitungan tampilan
+
+    Penyimpanan menyimpan uang sebagai sen Int64 (eksak) dan sel kosong
+    sebagai <NA>; grafik dan format angka memakai rupiah float64 dengan NaN.
+
+    Parameters:
+    - df: DataFrame transaksi atau agregat harian dari penyimpanan
+
+    Returns:
+    - Salinan dangkal DataFrame dengan kolom uang dalam rupiah
+    """
+    df = df.copy(deep=False)
+    for kolom in KOLOM_UANG + ["profit_margin"]:
+        if kolom in df.columns:
+            nilai = df[kolom].to_numpy(dtype=np.float64, na_value=np.nan)
+            df[kolom] = nilai / 100 if kolom in KOLOM_RUPIAH else nilai
+    return df
+
+def agregat_per_transaksi(df, kunci, ukuran):
+    """
+    Agregasi per grup dengan rata-rata per transaksi
+
+    Pada mode agregat harian kolom jumlahan (sales_qty, revenue, cost,
+    profit) berisi total beberapa transaksi, sehingga rata-ratanya
+    dihitung sebagai total kolom dibagi total `jumlah_transaksi`, bukan
+    rata-rata antar baris.
+
+    Parameters:
+    - df: DataFrame transaksi atau agregat harian
+    - kunci: Kolom pengelompokan
+    - ukuran: Dict kolom -> fungsi agregasi (seperti `DataFrame.agg`)
+
+    Returns:
+    - DataFrame hasil agregasi
+    """
+    if "jumlah_transaksi" not in df.columns:
+        return df.groupby(kunci, as_index=False).agg(ukuran)
+
+    rata = [k for k, f in ukuran.items() if f == "mean" and k in KOLOM_JUMLAHAN]
+    ukuran = {**ukuran, **{k: "sum" for k in rata}, "jumlah_transaksi": "sum"}
+    hasil = df.groupby(kunci, as_index=False).agg(ukuran)
+    for k in rata:
+        hasil[k] = hasil[k] / hasil["jumlah_transaksi"]
+    return hasil.drop(columns="jumlah_transaksi")
+
 def tambahkan_hover_uang(fig, df, kolom, tipe="bar"):
     """
     Tambahkan hover template untuk visualisasi uang
@@ -92,67 +170,118 @@ st.set_page_config(
     page_icon="📊"
 )
 
-DATA_FILE = "itdeltech_2025.csv"
-
 # =====================================================
 # MEMUAT DATA (DATA LOADING)
 # =====================================================
-@st.cache_data
-def muat_data():
+# Kolom yang dipakai visualisasi; hanya kolom ini yang dibaca dari penyimpanan
+KOLOM_DASHBOARD = (
+    ["date", "bulan", "nama_bulan", "tahun", "hari", "minggu"]
+    + KOLOM_DIMENSI
+    + KOLOM_UANG
+    + ["discount", "profit_margin"]
+)
+
+DAFTAR_MENU = [
+    "📊 Dashboard Utama",
+    "📈 Tren Pendapatan",
+    "📊 Performa Produk",
+    "🏙️ Performa Kota",
+    "📦 Analisis Kategori",
+    "🛒 Analisis Channel",
+    "💰 Analisis Profitabilitas",
+    "📉 Analisis Diskonting",
+    "📅 Analisis Waktu",
+    "📱 Analisis Pelanggan",
+    "📋 Tabel Data Lengkap"
+]
+
+def siapkan_berkas(path):
+    """
+    Menyiapkan penyimpanan data dari file CSV
+
+    CSV dibersihkan sekali dan disimpan sebagai Parquet yang dipartisi per
+    bulan di samping CSV; yang disimpan di memori hanya ringkasannya
+    (rentang tanggal, nilai dimensi, kolom). CSV yang terlalu besar untuk
+    memori dimuat sebagai agregat harian.
     """
-    Memuat dan mempersiapkan data dari file CSV
+    info = siapkan_partisi(path)
+    if os.path.getsize(path) > BATAS_CSV_MB * 1024 * 1024:
+        info["harian"] = muat_harian(path)
+    return info
+
+def hapus_versi_lama(lama, baru):
     """
+    Hapus folder partisi yang tidak lagi dirujuk setelah ringkasan ditukar
+
+    Versi yang baru saja diganti tetap disimpan: sesi yang sedang berjalan
+    dengan ringkasan lama masih bisa menyelesaikan pembacaannya.
+    """
+    simpan = {baru["bagian"]}
+    if lama is not None:
+        simpan.add(lama["bagian"])
+    hapus_partisi_lama(DATA_FILE, simpan=simpan)
+
+@st.cache_resource
+def pemantau_data():
+    """
+    Satu pemantau per server: CSV yang diganti dimuat ulang di thread
+    latar lalu ditukar masuk, tanpa restart dan tanpa menahan request
+    """
+    return PemantauTransaksi(DATA_FILE, muat=siapkan_berkas, setelah_tukar=hapus_versi_lama).mulai()
+
+def muat_info():
+    """
+    Ringkasan data terbaru untuk sesi ini
+    """
+    pemantau = pemantau_data()
     try:
-        df = pd.read_csv(DATA_FILE, parse_dates=["date"])
-        
-        # Kolom yang berisi data uang
-        kolom_uang = ["unit_price", "sales_qty", "revenue", "cost", "profit"]
-        
-        # Konversi kolom uang ke numerik
-        for kolom in kolom_uang:
-            if kolom in df.columns:
-                if df[kolom].dtype == "object":
-                    # Bersihkan format string
-                    df[kolom] = (
-                        df[kolom].astype(str)
-                        .str.replace("Rp", "", regex=False)
-                        .str.replace(".", "", regex=False)
-                        .str.replace(",", ".", regex=False)
-                    )
-                df[kolom] = pd.to_numeric(df[kolom], errors="coerce")
-        
-        # Ekstrak informasi bulan
-        df["bulan"] = df["date"].dt.month
-        df["nama_bulan"] = df["date"].dt.strftime("%B")
-        df["tahun"] = df["date"].dt.year
-        df["hari"] = df["date"].dt.day
-        df["minggu"] = df["date"].dt.isocalendar().week
-        
-        # Optimasi memori dengan tipe data kategori
-        for kolom in ["city", "category", "channel", "product_name", "customer_type"]:
-            if kolom in df.columns:
-                df[kolom] = df[kolom].astype("category")
-        
-        # Hitung profit margin jika tidak ada
-        if "profit_margin" not in df.columns:
-            df["profit_margin"] = (df["profit"] / df["revenue"] * 100).round(2)
-        
-        return df
+        info = pemantau.data()
     except Exception as e:
         st.error(f"❌ Gagal memuat data: {str(e)}")
-        return pd.DataFrame()
+        return None
+    if pemantau.galat is not None:
+        st.warning(f"⚠️ CSV terbaru gagal dimuat, menampilkan data sebelumnya: {pemantau.galat}")
+    return info
+
+@st.cache_data(max_entries=32)
+def muat_rentang_data(bagian, awal, akhir, kolom, saring):
+    """
+    Baris transaksi dalam rentang tanggal; hanya partisi bulan yang
+    beririsan dan kolom yang dibutuhkan yang dibaca. Folder partisi
+    (bernama menurut sha256 CSV) menjadi kunci cache, sehingga isi cache
+    selalu sesuai dengan versi data yang dibaca.
+    """
+    return muat_rentang(DATA_FILE, awal, akhir, kolom=kolom, saring=dict(saring), bagian=bagian)
 
-df = muat_data()
+info = muat_info()
 
 # Validasi data
-if df.empty:
+if info is None or info["tanggal_min"] is None:
     st.error("❌ Data tidak ditemukan atau file kosong")
     st.stop()
 
-if "revenue" not in df.columns:
+if "revenue" not in info["kolom"]:
     st.error("❌ Kolom 'revenue' tidak ditemukan dalam data")
     st.stop()
 
+if "harian" in info:
+    st.info(
+        "📦 Data besar: dashboard memakai agregat harian per kota, kategori, "
+        "produk, channel, dan tipe pelanggan. Rata-rata per transaksi adalah perkiraan."
+    )
+
+# Laporan sel uang yang tidak bisa di-parse (dikosongkan, tidak ditebak)
+sel_tidak_valid = info["sel_tidak_valid"]
+if sel_tidak_valid:
+    pesan = ["⚠️ Sebagian nilai uang tidak valid dan dikosongkan:"]
+    for kolom, rincian in sel_tidak_valid.items():
+        jumlah = f"{rincian['jumlah']:,}".replace(",", ".")
+        baris = ", ".join(map(str, rincian["baris"]))
+        if rincian["jumlah"] > len(rincian["baris"]):
+            baris += ", …"
+        pesan.append(f"- `{kolom}`: {jumlah} sel (baris CSV {baris})")
+    st.warning("\n".join(pesan))
+
 # =====================================================
 # SIDEBAR (NAVIGASI)
 # =====================================================
@@ -161,24 +290,25 @@ st.sidebar.markdown("---")
 
 # Filter tanggal
 st.sidebar.subheader("🗓️ Filter Tanggal")
-if not df.empty:
-    tanggal_min = df["date"].min().date()
-    tanggal_max = df["date"].max().date()
-    rentang_tanggal = st.sidebar.date_input(
-        "Pilih rentang tanggal",
-        [tanggal_min, tanggal_max],
-        min_value=tanggal_min,
-        max_value=tanggal_max
-    )
-    
-    if len(rentang_tanggal) == 2:
-        df = df[(df["date"].dt.date >= rentang_tanggal[0]) & 
-                (df["date"].dt.date <= rentang_tanggal[1])]
+tanggal_min = pd.Timestamp(info["tanggal_min"]).date()
+tanggal_max = pd.Timestamp(info["tanggal_max"]).date()
+rentang_tanggal = st.sidebar.date_input(
+    "Pilih rentang tanggal",
+    [tanggal_min, tanggal_max],
+    min_value=tanggal_min,
+    max_value=tanggal_max
+)
+if len(rentang_tanggal) == 2:
+    awal, akhir = rentang_tanggal
+else:
+    awal, akhir = tanggal_min, tanggal_max
+
+saring = {}
 
 # Filter kategori
 st.sidebar.subheader("🏷️ Filter Kategori")
-if "category" in df.columns:
-    semua_kategori = ["Semua"] + sorted(df["category"].unique().tolist())
+if "category" in info["dimensi"]:
+    semua_kategori = ["Semua"] + info["dimensi"]["category"]
     kategori_terpilih = st.sidebar.multiselect(
         "Pilih kategori produk",
         semua_kategori,
@@ -186,12 +316,12 @@ if "category" in df.columns:
     )
     
     if "Semua" not in kategori_terpilih and kategori_terpilih:
-        df = df[df["category"].isin(kategori_terpilih)]
+        saring["category"] = tuple(kategori_terpilih)
 
 # Filter kota
 st.sidebar.subheader("🏙️ Filter Kota")
-if "city" in df.columns:
-    semua_kota = ["Semua"] + sorted(df["city"].unique().tolist())
+if "city" in info["dimensi"]:
+    semua_kota = ["Semua"] + info["dimensi"]["city"]
     kota_terpilih = st.sidebar.multiselect(
         "Pilih kota",
         semua_kota,
@@ -199,27 +329,31 @@ if "city" in df.columns:
     )
     
     if "Semua" not in kota_terpilih and kota_terpilih:
-        df = df[df["city"].isin(kota_terpilih)]
+        saring["city"] = tuple(kota_terpilih)
 
 st.sidebar.markdown("---")
 
 # Menu navigasi
-menu = st.sidebar.radio(
-    "📋 PILIH VISUALISASI",
-    [
-        "📊 Dashboard Utama",
-        "📈 Tren Pendapatan",
-        "📊 Performa Produk",
-        "🏙️ Performa Kota",
-        "📦 Analisis Kategori",
-        "🛒 Analisis Channel",
-        "💰 Analisis Profitabilitas",
-        "📉 Analisis Diskonting",
-        "📅 Analisis Waktu",
-        "📱 Analisis Pelanggan",
-        "📋 Tabel Data Lengkap"
-    ]
-)
+menu = st.sidebar.radio("📋 PILIH VISUALISASI", DAFTAR_MENU)
+
+# Data sesuai filter: partisi bulan di luar rentang tidak dibuka sama sekali
+if "harian" in info:
+    df = info["harian"]
+    df = df[(df["date"].dt.date >= awal) & (df["date"].dt.date <= akhir)]
+    for kolom, nilai in saring.items():
+        df = df[df[kolom].isin(nilai)]
+else:
+    # Tabel data lengkap menampilkan semua kolom; menu lain cukup kolom dashboard
+    kolom = None if menu == "📋 Tabel Data Lengkap" else tuple(KOLOM_DASHBOARD)
+    try:
+        df = muat_rentang_data(info["bagian"], awal, akhir, kolom, tuple(sorted(saring.items())))
+    except FileNotFoundError:
+        # Ringkasan sesi ini sudah dua versi tertinggal dan foldernya dihapus:
+        # jalankan ulang dengan ringkasan terbaru
+        st.rerun()
+
+# Sen eksak dari penyimpanan baru dirupiahkan di sini, untuk tampilan
+df = nilai_tampilan(df)
 
 # =====================================================
 # DASHBOARD UTAMA
@@ -236,7 +370,7 @@ if menu == "📊 Dashboard Utama":
         st.metric(
             label="💰 Total Pendapatan",
             value=format_angka_otomatis(total_pendapatan),
-            delta=f"{len(df):,} transaksi".replace(",", ".")
+            delta=f"{hitung_transaksi(df):,} transaksi".replace(",", ".")
         )
 
     with col2:
@@ -289,7 +423,7 @@ if menu == "📊 Dashboard Utama":
     col7, col8 = st.columns(2)
 
     with col7:
-        rata_transaksi = total_pendapatan / len(df) if len(df) > 0 else 0
+        rata_transaksi = total_pendapatan / hitung_transaksi(df) if len(df) > 0 else 0
         st.metric(
             label="💵 Rata-rata Transaksi",
             value=format_angka_otomatis(rata_transaksi),
@@ -496,7 +630,7 @@ if menu == "📊 Dashboard Utama":
         - **Bulan Terendah**: {bulan_terendah}
         - **Pertumbuhan MoM**: {pertumbuhan:.1f}%
         - **Jumlah Kota**: {kota_aktif} dari target
-        - **Transaksi/Hari**: {(len(df) / df['date'].nunique()):.0f}
+        - **Transaksi/Hari**: {(hitung_transaksi(df) / df['date'].nunique()):.0f}
         """)
 
 # =====================================================
@@ -1268,9 +1402,13 @@ elif menu == "📉 Analisis Diskonting":
             
             with col1:
                 # Histogram diskon
+                # Pada agregat harian setiap baris mewakili `jumlah_transaksi` transaksi
+                berbobot = "jumlah_transaksi" in df_diskon.columns
                 fig = px.histogram(
                     df_diskon,
                     x="discount",
+                    y="jumlah_transaksi" if berbobot else None,
+                    histfunc="sum" if berbobot else "count",
                     nbins=20,
                     title="Distribusi Tingkat Diskon",
                     color_discrete_sequence=["#d62728"]
@@ -1307,9 +1445,12 @@ elif menu == "📉 Analisis Diskonting":
         with tab2:
             st.subheader("Dampak Diskon terhadap Penjualan")
             
-            # Scatter plot diskon vs volume
+            # Scatter plot diskon vs volume; ukuran titik tidak boleh kosong
+            # atau negatif (sel uang tidak valid menjadi NaN)
+            df_sebar = df_diskon.dropna(subset=["sales_qty", "revenue"])
+            df_sebar = df_sebar[df_sebar["revenue"] >= 0]
             fig = px.scatter(
-                df_diskon,
+                df_sebar,
                 x="discount",
                 y="sales_qty",
                 color="revenue",
@@ -1337,7 +1478,7 @@ elif menu == "📉 Analisis Diskonting":
                 labels=["0-5%", "5-10%", "10-15%", "15-20%", "20-30%", "30-50%", "50+%"]
             )
             
-            df_effectiveness = df_diskon.groupby("discount_range", as_index=False).agg({
+            df_effectiveness = agregat_per_transaksi(df_diskon, "discount_range", {
                 "sales_qty": "mean",
                 "revenue": "mean",
                 "profit_margin": "mean"
@@ -1505,7 +1646,7 @@ elif menu == "📅 Analisis Waktu":
             df["hari_dalam_minggu"] = df["date"].dt.day_name()
             df["hari_dalam_minggu_num"] = df["date"].dt.dayofweek
             
-            df_hari = df.groupby(["hari_dalam_minggu", "hari_dalam_minggu_num"], as_index=False).agg({
+            df_hari = agregat_per_transaksi(df, ["hari_dalam_minggu", "hari_dalam_minggu_num"], {
                 "revenue": "mean",
                 "sales_qty": "mean"
             }).sort_values("hari_dalam_minggu_num")
@@ -1531,7 +1672,7 @@ elif menu == "📅 Analisis Waktu":
             # Heatmap hari vs bulan
             st.subheader("Heatmap: Hari vs Performa")
             
-            df_hari_bulan = df.groupby(["hari_dalam_minggu_num", "bulan"], as_index=False)["revenue"].mean()
+            df_hari_bulan = agregat_per_transaksi(df, ["hari_dalam_minggu_num", "bulan"], {"revenue": "mean"})
             pivot = df_hari_bulan.pivot(index="hari_dalam_minggu_num", columns="bulan", values="revenue")
             
             # Map hari angka ke nama
@@ -1676,22 +1817,20 @@ elif menu == "📱 Analisis Pelanggan":
             st.subheader("Customer Value Analysis")
             
             # Hitung metrics per pelanggan
-            df_customer_value = df.groupby("customer_type", as_index=False).agg({
-                "revenue": ["sum", "mean", "std"],
-                "sales_qty": ["sum", "mean"],
+            df_customer_value = df.groupby("customer_type", as_index=False).agg(
+                total_revenue=("revenue", "sum"),
+                total_quantity=("sales_qty", "sum")
+            )
+            df_rata = agregat_per_transaksi(df, "customer_type", {
+                "revenue": "mean",
+                "sales_qty": "mean",
                 "profit_margin": "mean"
+            }).rename(columns={
+                "revenue": "avg_transaction",
+                "sales_qty": "avg_quantity",
+                "profit_margin": "avg_margin"
             })
-            
-            # Flatten multi-index columns
-            df_customer_value.columns = [
-                "customer_type",
-                "total_revenue",
-                "avg_transaction",
-                "std_transaction",
-                "total_quantity",
-                "avg_quantity",
-                "avg_margin"
-            ]
+            df_customer_value = df_customer_value.merge(df_rata, on="customer_type")
             
             # Visualisasi
             fig = make_subplots(
@@ -1766,7 +1905,7 @@ elif menu == "📋 Tabel Data Lengkap":
     st.markdown("---")
     
     # Tampilkan jumlah baris
-    st.write(f"**Total Transaksi:** {len(df):,} baris".replace(",", "."))
+    st.write(f"**Total Transaksi:** {hitung_transaksi(df):,} baris".replace(",", "."))
     
     # Pilih kolom untuk ditampilkan
     semua_kolom = df.columns.tolist()
@@ -0,0 +1,282 @@
+"""
+Benchmark answer.py dan generator data kuesioner sintetis.
+
+Contoh:
+    python bench_kuesioner.py --sizes 1000 10000 100000 --skew 1.0
+    python bench_kuesioner.py --sizes 10000000 --engines parquet
+
+Setiap kombinasi (engine, ukuran) dijalankan di proses terpisah agar
+waktu impor dan memori puncak (VmHWM) tidak saling memengaruhi.
+Waktu dicatat terpisah untuk tahap load, agregasi, dan keluaran tiap
+pertanyaan q1–q13, lalu disimpan sebagai laporan JSON.
+
+Catatan: format xlsx dibatasi 1.048.576 baris per sheet, sehingga ukuran
+di atas itu hanya dibuat dalam format kolumnar (Parquet).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kuesioner import daftar_pertanyaan, hitung_matriks, jawab, label_kode, questions
+
+# Batas baris data satu sheet xlsx (di luar baris header)
+MAKS_BARIS_XLSX = 1_048_575
+
+ENGINES = ["xlsx", "cache", "stream", "parquet"]
+
+
+# =====================================================
+# GENERATOR DATA SINTETIS
+# =====================================================
+def peluang_skala(skew):
+    """
+    Peluang tiap kode skor 1–6; skew 0 = seragam, skew > 0 condong ke SS
+
+    Returns:
+    - Array peluang untuk kode 1..6
+    """
+    bobot = np.arange(1, 7, dtype=float) ** skew
+    return bobot / bobot.sum()
+
+
+def blok_kode(n, skew=1.0, kosong=0.0, seed=0, ukuran_blok=1_000_000):
+    """
+    Hasilkan matriks kode sintetis blok demi blok
+
+    Parameters:
+    - n: Jumlah responden
+    - skew: Kecondongan jawaban (lihat `peluang_skala`)
+    - kosong: Proporsi jawaban kosong
+    - seed: Seed generator acak
+    - ukuran_blok: Jumlah baris per blok
+
+    Yields:
+    - Array int8 berukuran (≤ ukuran_blok, 17)
+    """
+    rng = np.random.default_rng(seed)
+    p = np.append(kosong, (1 - kosong) * peluang_skala(skew))
+    for awal in range(0, n, ukuran_blok):
+        m = min(ukuran_blok, n - awal)
+        yield rng.choice(7, size=(m, len(questions)), p=p).astype(np.int8)
+
+
+def tulis_xlsx(path, n, **opsi):
+    """
+    Tulis workbook sintetis berformat sama dengan data_kuesioner.xlsx
+    """
+    from openpyxl import Workbook
+
+    if n > MAKS_BARIS_XLSX:
+        raise ValueError(f"xlsx maksimal {MAKS_BARIS_XLSX} baris, diminta {n}")
+
+    label = [None] + list(label_kode[1:])
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["Partisipan"] + questions)
+    nomor = 1
+    for blok in blok_kode(n, **opsi):
+        for baris in blok:
+            ws.append([nomor] + [label[k] for k in baris])
+            nomor += 1
+    wb.save(path)
+
+
+def tulis_parquet(path, n, **opsi):
+    """
+    Tulis padanan kolumnar (Parquet, kolom terkode kamus) dari workbook sintetis
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    kamus = pa.array(list(label_kode[1:]))
+    writer = None
+    nomor = 1
+    try:
+        for blok in blok_kode(n, **opsi):
+            kolom = {"Partisipan": pa.array(np.arange(nomor, nomor + len(blok)))}
+            for j, q in enumerate(questions):
+                kode = blok[:, j].astype(np.int32) - 1
+                kolom[q] = pa.DictionaryArray.from_arrays(
+                    pa.array(kode, mask=kode < 0), kamus
+                )
+            tabel = pa.table(kolom)
+            if writer is None:
+                writer = pq.ParquetWriter(path, tabel.schema)
+            writer.write_table(tabel)
+            nomor += len(blok)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# =====================================================
+# PENGUKURAN
+# =====================================================
+def _memori_puncak_kib():
+    """
+    Memori puncak (resident) proses ini dalam KiB
+
+    Di Linux ru_maxrss proses hasil spawn tetap membawa puncak proses
+    induk melintasi exec, sehingga dibaca VmHWM dari /proc/self/status.
+    Di sistem tanpa /proc dipakai ru_maxrss.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for baris in f:
+                if baris.startswith("VmHWM:"):
+                    return int(baris.split()[1])
+    except OSError:
+        pass
+    maks = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam byte di macOS, KiB di tempat lain
+    return maks // 1024 if platform.system() == "Darwin" else maks
+
+
+def _ukur(engine, path):
+    """
+    Jalankan satu engine dan catat waktu tiap tahap (dipanggil di proses anak)
+    """
+    hasil = {"engine": engine}
+
+    t0 = time.perf_counter()
+    if engine == "stream":
+        from muat_kuesioner import agregasi_streaming
+
+        # Load dan agregasi menyatu pada jalur streaming
+        hitung, n = agregasi_streaming(path)
+        hasil["load_s"] = None
+        hasil["agregasi_s"] = time.perf_counter() - t0
+    else:
+        if engine == "xlsx":
+            import pandas as pd
+            from kuesioner import kodekan
+
+            kode = kodekan(pd.read_excel(path))
+        elif engine == "parquet":
+            import pandas as pd
+            from kuesioner import kodekan
+
+            kode = kodekan(pd.read_parquet(path))
+        elif engine == "cache":
+            from muat_kuesioner import muat_kode
+
+            kode, _ = muat_kode(path)
+        else:
+            raise ValueError(f"engine tidak dikenal: {engine}")
+        hasil["load_s"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        hitung = hitung_matriks(kode)
+        n = len(kode)
+        hasil["agregasi_s"] = time.perf_counter() - t0
+
+    hasil["keluaran_s"] = {}
+    for q in daftar_pertanyaan:
+        t0 = time.perf_counter()
+        jawab(q, hitung, n)
+        hasil["keluaran_s"][q] = time.perf_counter() - t0
+
+    hasil["responden"] = int(n)
+    hasil["memori_puncak_kib"] = _memori_puncak_kib()
+    return hasil
+
+
+def ukur(engine, path):
+    """
+    Ukur satu engine di proses baru agar impor dan memori puncak terisolasi
+    """
+    konteks = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=konteks) as pool:
+        return pool.submit(_ukur, engine, path).result()
+
+
+def siapkan_data(folder, n, skew, kosong, seed):
+    """
+    Buat (atau pakai ulang) berkas sintetis untuk satu ukuran
+
+    Returns:
+    - Dict format -> lokasi berkas
+    """
+    os.makedirs(folder, exist_ok=True)
+    nama = f"kuesioner_n{n}_skew{skew:g}_kosong{kosong:g}_seed{seed}"
+    opsi = {"skew": skew, "kosong": kosong, "seed": seed}
+
+    berkas = {"parquet": os.path.join(folder, f"{nama}.parquet")}
+    if not os.path.exists(berkas["parquet"]):
+        tulis_parquet(berkas["parquet"], n, **opsi)
+
+    if n <= MAKS_BARIS_XLSX:
+        berkas["xlsx"] = os.path.join(folder, f"{nama}.xlsx")
+        if not os.path.exists(berkas["xlsx"]):
+            tulis_xlsx(berkas["xlsx"], n, **opsi)
+    return berkas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark answer.py pada data kuesioner sintetis")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="jumlah responden (10^3 sampai 10^7)")
+    parser.add_argument("--skew", type=float, default=1.0,
+                        help="kecondongan jawaban; 0 = seragam, makin besar makin condong ke SS")
+    parser.add_argument("--kosong", type=float, default=0.0,
+                        help="proporsi jawaban kosong")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument("--dir", default="bench_data",
+                        help="folder data sintetis (dipakai ulang antar run)")
+    parser.add_argument("--out", default="bench_kuesioner.json",
+                        help="lokasi laporan JSON")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    laporan = {
+        "waktu": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "skew": args.skew,
+        "kosong": args.kosong,
+        "seed": args.seed,
+        "hasil": [],
+    }
+
+    for n in args.sizes:
+        berkas = siapkan_data(args.dir, n, args.skew, args.kosong, args.seed)
+        for engine in args.engines:
+            path = berkas["parquet"] if engine == "parquet" else berkas.get("xlsx")
+            if path is None:
+                print(f"lewati {engine} n={n}: melebihi batas baris xlsx")
+                continue
+            if engine == "cache":
+                # Bangun cache lebih dulu; yang diukur adalah pemuatan hangat
+                ukur("cache", path)
+
+            hasil = ukur(engine, path)
+            hasil["ukuran"] = n
+            hasil["berkas"] = path
+            laporan["hasil"].append(hasil)
+
+            load = "-" if hasil["load_s"] is None else f"{hasil['load_s']:.4f}s"
+            print(
+                f"{engine:8s} n={n:<9d} load={load} "
+                f"agregasi={hasil['agregasi_s']:.4f}s "
+                f"keluaran={sum(hasil['keluaran_s'].values()) * 1e3:.3f}ms "
+                f"memori={hasil['memori_puncak_kib'] / 1024:.1f}MiB"
+            )
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(laporan, f, indent=2)
+    print(f"Laporan disimpan di {args.out}")
+
+
+if __name__ == "__main__":
+    main()
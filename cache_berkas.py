@@ -0,0 +1,139 @@
+"""
+Kunci cache berkas data di folder `<berkas>.cache/`.
+
+Dipakai bersama oleh pemuat kuesioner dan pemuat transaksi: metadata
+(ukuran, mtime, SHA-256 isi) disimpan di `meta.json`, dan semua berkas
+cache ditulis atomik lewat berkas sementara.
+"""
+import hashlib
+import json
+import os
+
+
+def folder_cache(path):
+    """
+    Lokasi folder cache untuk sebuah berkas data
+    """
+    return f"{path}.cache"
+
+
+def hash_berkas(path, ukuran_blok=1 << 20):
+    """
+    Hitung hash SHA-256 isi berkas secara bertahap
+
+    Parameters:
+    - path: Lokasi berkas
+    - ukuran_blok: Jumlah byte yang dibaca per langkah
+
+    Returns:
+    - String heksadesimal hash SHA-256
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for blok in iter(lambda: f.read(ukuran_blok), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def tulis_atomik(path, tulis):
+    """
+    Tulis berkas lewat berkas sementara lalu ganti secara atomik
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        tulis(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def baca_meta(folder):
+    try:
+        with open(os.path.join(folder, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def tulis_meta(folder, meta):
+    def tulis(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    tulis_atomik(os.path.join(folder, "meta.json"), tulis)
+
+
+def kunci_cache(path):
+    """
+    Periksa kunci cache berkas data dan kembalikan metadata yang berlaku
+
+    Ukuran dan mtime dicek lebih dulu; hash isi hanya dihitung bila
+    keduanya tidak cocok, sehingga berkas yang sekadar di-touch tidak
+    memicu parse ulang.
+
+    Parameters:
+    - path: Lokasi berkas data
+
+    Returns:
+    - Tuple (meta, valid); `meta` berisi ukuran, mtime_ns dan sha256
+      berkas saat ini, `valid` bernilai True bila cache lama masih
+      sesuai dengan isi berkas
+    """
+    folder = folder_cache(path)
+    lama = baca_meta(folder)
+    stat = os.stat(path)
+
+    if lama.get("ukuran") == stat.st_size and lama.get("mtime_ns") == stat.st_mtime_ns:
+        return lama, True
+
+    meta = {
+        "ukuran": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hash_berkas(path),
+    }
+    valid = bool(lama) and lama.get("sha256") == meta["sha256"]
+    if valid:
+        # Isi sama, hanya mtime yang berubah: field versi dari cache lama
+        # (mis. versi_bertahap, ringkasan) tetap berlaku
+        meta = {**lama, **meta}
+        tulis_meta(folder, meta)
+    return meta, valid
+
+
+# Hash isi per (lokasi, ukuran, mtime) yang sudah diketahui di proses ini
+_hash_diketahui = {}
+
+
+def hash_isi(path):
+    """
+    Hash SHA-256 isi berkas, cukup dengan os.stat bila sudah pernah dihitung
+
+    Dipakai sebagai kunci cache Streamlit: selama ukuran dan mtime berkas
+    tidak berubah, pemanggilan ulang tidak membaca berkas apa pun.
+
+    Parameters:
+    - path: Lokasi berkas data
+
+    Returns:
+    - String heksadesimal hash SHA-256
+    """
+    stat = os.stat(path)
+    tanda = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if tanda not in _hash_diketahui:
+        meta, _ = kunci_cache(path)
+        _hash_diketahui[tanda] = meta["sha256"]
+    return _hash_diketahui[tanda]
+
+
+def tanda_berkas(path):
+    """
+    Tanda murah (ukuran, mtime) sebuah berkas; None bila berkas tidak ada
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
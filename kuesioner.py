@@ -0,0 +1,474 @@
+"""
+Mesin agregasi jawaban kuesioner skala Likert (Q1–Q17).
+
+Seluruh jawaban q1–q13 dihitung dari satu matriks hitungan
+pertanyaan × skala (17×6) yang dibangun dalam satu lintasan vektor
+atas jawaban yang sudah dikodekan menjadi bilangan bulat.
+"""
+import numpy as np
+
+# Daftar kolom pertanyaan Q1–Q17
+questions = [f"Q{i}" for i in range(1, 18)]
+
+# Urutan skala
+scales = ["SS", "S", "CS", "CTS", "TS", "STS"]
+
+# Mapping skor
+score_map = {
+    "SS": 6,
+    "S": 5,
+    "CS": 4,
+    "CTS": 3,
+    "TS": 2,
+    "STS": 1
+}
+
+# Kode pertanyaan yang bisa dijawab
+daftar_pertanyaan = [f"q{i}" for i in range(1, 14)]
+
+# Kode untuk jawaban kosong atau tidak valid
+KODE_KOSONG = 0
+
+# Skor tiap kolom matriks hitungan (urutan mengikuti `scales`)
+bobot_skor = np.array([score_map[s] for s in scales], dtype=np.int64)
+
+# Kategori sentimen dan kelompok tiap skala; dipakai q13 dan dashboard
+KATEGORI_SENTIMEN = ["negatif", "netral", "positif"]
+sentimen_skala = {
+    "SS": "positif",
+    "S": "positif",
+    "CS": "netral",
+    "CTS": "negatif",
+    "TS": "negatif",
+    "STS": "negatif"
+}
+
+# Kode sentimen tiap kolom matriks hitungan (indeks ke `KATEGORI_SENTIMEN`)
+kode_sentimen = np.array([KATEGORI_SENTIMEN.index(sentimen_skala[s]) for s in scales], dtype=np.int64)
+
+# Kamus kode -> label (indeks = kode int8; kode 0 = kosong)
+label_kode = np.array([""] + sorted(score_map, key=score_map.get))
+
+# Nilai jawaban yang dikenali -> kode skor: label Likert, skor angka 1–6,
+# atau skor angka yang tersimpan sebagai teks (mis. dari CSV)
+kode_nilai = {
+    **score_map,
+    **{skor: skor for skor in score_map.values()},
+    **{str(skor): skor for skor in score_map.values()},
+}
+
+# Tabel kode kategori `kode_nilai` -> kode skor; indeks -1 (tidak dikenal) -> kosong
+_kode_dari_kategori = np.array(list(kode_nilai.values()) + [KODE_KOSONG], dtype=np.int8)
+
+# Pertanyaan "skala X terbanyak" (q3–q8)
+skala_terbanyak = {
+    "q3": "SS",
+    "q4": "S",
+    "q5": "CS",
+    "q6": "CTS",
+    "q7": "TS",
+    "q8": "TS",  # sesuai soal, sama seperti q7
+}
+
+
+def kodekan(df):
+    """
+    Ubah kolom Q1–Q17 menjadi matriks kode int8
+
+    Pengodean jawaban dideteksi otomatis. Bila semua kolom bertipe angka
+    (skor 1–6), kode langsung diambil dari nilainya. Selain itu ketujuh
+    belas kolom dikodekan sekaligus lewat satu Categorical atas
+    `kode_nilai`, sehingga label, angka, dan angka-sebagai-teks (juga
+    campurannya) hanya dibandingkan sekali di hashtable pandas.
+
+    Parameters:
+    - df: DataFrame berisi kolom Q1–Q17 berisi label SS/S/CS/CTS/TS/STS
+      atau skor 1–6
+
+    Returns:
+    - Array int8 berukuran (n, 17), urutan kolom (column-major);
+      kode = skor 1–6 sesuai `score_map`, KODE_KOSONG untuk jawaban
+      kosong atau tidak valid
+    """
+    import pandas as pd
+
+    kolom = df[questions]
+    if all(pd.api.types.is_numeric_dtype(t) for t in kolom.dtypes):
+        nilai = kolom.to_numpy(dtype=np.float64)
+        kode = np.where(np.isin(nilai, bobot_skor), nilai, KODE_KOSONG)
+        return np.asfortranarray(kode.astype(np.int8))
+
+    nilai = kolom.to_numpy(dtype=object).ravel(order="F")
+    kategori = pd.Categorical(nilai, categories=list(kode_nilai)).codes
+    kode = _kode_dari_kategori[kategori]
+    return kode.reshape((len(df), len(questions)), order="F")
+
+
+def hitung_matriks(kode):
+    """
+    Bangun matriks hitungan pertanyaan × skala dalam satu lintasan
+
+    Parameters:
+    - kode: Matriks kode int8 berukuran (n, 17) hasil `kodekan`
+
+    Returns:
+    - Array int64 berukuran (17, 6); kolom mengikuti urutan `scales`
+    """
+    k = len(questions)
+    n_kode = len(scales) + 1
+    indeks = kode.astype(np.intp) + np.arange(k, dtype=np.intp) * n_kode
+    hitung = np.bincount(indeks.ravel(), minlength=k * n_kode).reshape(k, n_kode)
+    # Kolom kode 6..1 = SS..STS; kolom kode 0 (kosong) dibuang
+    return np.ascontiguousarray(hitung[:, :0:-1])
+
+
+def hitung_per_segmen(kode, segmen, n_segmen):
+    """
+    Matriks hitungan untuk semua segmen dalam satu hitungan berkelompok
+
+    Setiap sel dipetakan ke indeks (segmen, pertanyaan, kode) lalu dihitung
+    dengan satu `np.bincount`, tanpa memfilter data per segmen.
+
+    Parameters:
+    - kode: Matriks kode int8 berukuran (n, 17)
+    - segmen: Array kode segmen 0 … n_segmen - 1 per responden
+    - n_segmen: Jumlah segmen
+
+    Returns:
+    - Tuple (hitung, n); `hitung` array (n_segmen, 17, 6) dan `n` jumlah
+      responden per segmen
+    """
+    k = len(questions)
+    n_kode = len(scales) + 1
+    segmen = np.asarray(segmen, dtype=np.intp)
+    indeks = (segmen[:, None] * k + np.arange(k, dtype=np.intp)) * n_kode + kode
+    hitung = np.bincount(indeks.ravel(), minlength=n_segmen * k * n_kode)
+    hitung = hitung.reshape(n_segmen, k, n_kode)[:, :, :0:-1]
+    return np.ascontiguousarray(hitung), np.bincount(segmen, minlength=n_segmen)
+
+
+def rata_rata_per_pertanyaan(hitung):
+    """
+    Rata-rata skor tiap pertanyaan (jawaban kosong tidak ikut dihitung)
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (hitung @ bobot_skor) / hitung.sum(axis=1)
+
+
+def histogram_total(kode):
+    """
+    Histogram total skor per responden (0 … 6 × 17; jawaban kosong = 0)
+
+    Parameters:
+    - kode: Matriks kode int8 berukuran (n, 17)
+
+    Returns:
+    - Array int64 panjang 6 × 17 + 1; indeks = total skor satu responden
+    """
+    total = kode.sum(axis=1, dtype=np.intp)
+    return np.bincount(total, minlength=max(score_map.values()) * len(questions) + 1)
+
+
+def bootstrap_rata_rata(hitung, n, hist_total, resample=10_000, ci=95, seed=None):
+    """
+    Selang kepercayaan bootstrap (persentil) untuk rata-rata skor
+
+    Rata-rata keseluruhan (definisi q10) dan rata-rata tiap pertanyaan
+    hanya bergantung pada sebaran nilai yang diresample, sehingga setiap
+    resample berukuran n cukup ditarik sebagai satu vektor hitungan
+    multinomial atas nilai-nilai yang mungkin (7 kode per pertanyaan,
+    103 total skor per responden). Hasilnya sama secara distribusi dengan
+    menarik n indeks responden, tetapi semua resample selesai dalam satu
+    operasi tanpa bergantung pada jumlah responden.
+
+    Parameters:
+    - hitung: Matriks hitungan (17, 6)
+    - n: Jumlah responden
+    - hist_total: Hasil `histogram_total`
+    - resample: Jumlah resample bootstrap
+    - ci: Tingkat kepercayaan dalam persen
+    - seed: Seed generator acak
+
+    Returns:
+    - Dict nama -> (rata-rata, batas bawah, batas atas); nama "rata2" untuk
+      rata-rata keseluruhan dan "Q1" … "Q17" untuk tiap pertanyaan
+    """
+    rng = np.random.default_rng(seed)
+    batas = [(100 - ci) / 2, 100 - (100 - ci) / 2]
+    hasil = {}
+
+    # Rata-rata keseluruhan: total skor per responden / (17 × n)
+    nilai_total = np.arange(len(hist_total))
+    tarik = rng.multinomial(n, hist_total / n, size=resample)
+    rata2 = (tarik @ nilai_total) / (len(questions) * n)
+    bawah, atas = np.percentile(rata2, batas)
+    hasil["rata2"] = ((hist_total @ nilai_total) / (len(questions) * n), bawah, atas)
+
+    # Tiap pertanyaan: kode 0 (kosong) … 6, semua pertanyaan sekaligus
+    per_kode = np.column_stack([n - hitung.sum(axis=1), hitung[:, ::-1]])
+    tarik = rng.multinomial(n, per_kode / n, size=(resample, len(questions)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rata2 = (tarik @ np.arange(per_kode.shape[1])) / tarik[:, :, 1:].sum(axis=2)
+    bawah, atas = np.nanpercentile(rata2, batas, axis=0)
+    for q, m, b, a in zip(questions, rata_rata_per_pertanyaan(hitung), bawah, atas):
+        hasil[q] = (m, b, a)
+
+    return hasil
+
+
+def statistik_lengkap(kode, ukuran_blok=1_000_000):
+    """
+    Statistik cukup kovarians skor dari responden yang menjawab Q1–Q17 lengkap
+
+    Dihitung per blok agar memori sementara tetap kecil; hasilnya bisa
+    dijumlahkan antar blok atau antar file.
+
+    Parameters:
+    - kode: Matriks kode int8 berukuran (n, 17)
+    - ukuran_blok: Jumlah baris per blok
+
+    Returns:
+    - Tuple (n, jumlah, silang): jumlah responden lengkap, jumlah skor per
+      pertanyaan (17,) dan jumlah hasil kali skor antar pertanyaan (17, 17)
+    """
+    k = kode.shape[1]
+    n = 0
+    jumlah = np.zeros(k)
+    silang = np.zeros((k, k))
+    for awal in range(0, len(kode), ukuran_blok):
+        blok = kode[awal:awal + ukuran_blok]
+        # Skor bulat kecil, sehingga perkalian float64 (BLAS) tetap eksak
+        blok = blok[(blok != KODE_KOSONG).all(axis=1)].astype(np.float64)
+        n += len(blok)
+        jumlah += blok.sum(axis=0)
+        silang += blok.T @ blok
+    return n, jumlah, silang
+
+
+def kovarians(n, jumlah, silang):
+    """
+    Matriks kovarians sampel (ddof=1) dari hasil `statistik_lengkap`
+    """
+    if n < 2:
+        return np.full(silang.shape, np.nan)
+    return (silang - np.outer(jumlah, jumlah) / n) / (n - 1)
+
+
+def reliabilitas(kov):
+    """
+    Cronbach's alpha, alpha jika item dihapus, dan korelasi item-total
+    terkoreksi, semuanya dari satu matriks kovarians
+
+    Menghapus item i cukup mengurangi baris/kolom i dari jumlah varians,
+    sehingga semua item selesai dalam O(k²) tanpa menghitung ulang
+    kovarians untuk tiap subset kolom.
+
+    Parameters:
+    - kov: Matriks kovarians (k, k)
+
+    Returns:
+    - Dict "alpha" (skalar), "alpha_jika_dihapus" (k,) dan
+      "korelasi_item_total" (k,)
+    """
+    k = len(kov)
+    varians = np.diag(kov)
+    var_total = kov.sum()
+    baris = kov.sum(axis=1)
+
+    # Varians total skala tanpa item i dan kovarians item i dengan sisanya
+    var_sisa = var_total - 2 * baris + varians
+    kov_sisa = baris - varians
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        alpha = k / (k - 1) * (1 - varians.sum() / var_total)
+        alpha_hapus = (k - 1) / (k - 2) * (1 - (varians.sum() - varians) / var_sisa)
+        korelasi = kov_sisa / np.sqrt(varians * var_sisa)
+
+    return {
+        "alpha": alpha,
+        "alpha_jika_dihapus": alpha_hapus,
+        "korelasi_item_total": korelasi,
+    }
+
+
+def tabel_silang(kode, ukuran_blok=65536):
+    """
+    Tabel hitungan gabungan kode antar pertanyaan (statistik cukup korelasi)
+
+    Sel [7·i + a, 7·j + b] = jumlah responden dengan kode a di pertanyaan i
+    dan kode b di pertanyaan j. Jumlah, jumlah kuadrat, dan hasil kali
+    silang tiap pasangan pertanyaan (serta peringkatnya) bisa dibaca dari
+    tabel ini, dan tabel dari batch respons baru cukup dijumlahkan.
+
+    Parameters:
+    - kode: Matriks kode int8 berukuran (n, k)
+    - ukuran_blok: Jumlah baris per blok one-hot
+
+    Returns:
+    - Array int64 berukuran (7k, 7k)
+    """
+    n_kode = max(score_map.values()) + 1
+    k = kode.shape[1]
+    satu = np.eye(n_kode, dtype=np.float32)
+    tabel = np.zeros((k * n_kode, k * n_kode), dtype=np.int64)
+    for awal in range(0, len(kode), ukuran_blok):
+        # Hitungan per blok < 2^24, sehingga float32 (BLAS) tetap eksak
+        onehot = satu[kode[awal:awal + ukuran_blok]].reshape(-1, k * n_kode)
+        tabel += (onehot.T @ onehot).astype(np.int64)
+    return tabel
+
+
+def korelasi(tabel, metode="pearson"):
+    """
+    Matriks korelasi antar pertanyaan dari `tabel_silang`
+
+    Tiap pasangan memakai responden yang menjawab keduanya (pairwise
+    complete). Untuk Spearman, skor diganti peringkat rata-rata (midrank)
+    yang dihitung dari marginal tabel pasangan tersebut, jadi biayanya
+    tetap O(k² × 6²) berapa pun jumlah respondennya.
+
+    Parameters:
+    - tabel: Hasil `tabel_silang`
+    - metode: "pearson" atau "spearman"
+
+    Returns:
+    - Array float (k, k); NaN bila varians pasangan nol
+    """
+    n_kode = max(score_map.values()) + 1
+    k = len(tabel) // n_kode
+    # Buang kode kosong: gabungan[i, a, j, b] untuk skor a, b = 1..6
+    gabungan = tabel.reshape(k, n_kode, k, n_kode)[:, 1:, :, 1:].astype(np.float64)
+    n = gabungan.sum(axis=(1, 3))
+    m_x = gabungan.sum(axis=3)  # (i, a, j)
+    m_y = gabungan.sum(axis=1)  # (i, j, b)
+
+    if metode == "pearson":
+        skor = np.arange(1, n_kode, dtype=np.float64)
+        r_x = np.broadcast_to(skor[None, :, None], m_x.shape)
+        r_y = np.broadcast_to(skor[None, None, :], m_y.shape)
+    elif metode == "spearman":
+        r_x = np.cumsum(m_x, axis=1) - (m_x - 1) / 2
+        r_y = np.cumsum(m_y, axis=2) - (m_y - 1) / 2
+    else:
+        raise ValueError(f"metode tidak dikenal: {metode}")
+
+    s_x = np.einsum("iaj,iaj->ij", m_x, r_x)
+    s_xx = np.einsum("iaj,iaj->ij", m_x, r_x ** 2)
+    s_y = np.einsum("ijb,ijb->ij", m_y, r_y)
+    s_yy = np.einsum("ijb,ijb->ij", m_y, r_y ** 2)
+    s_xy = np.einsum("iajb,iaj,ijb->ij", gabungan, r_x, r_y)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (n * s_xy - s_x * s_y) / np.sqrt((n * s_xx - s_x ** 2) * (n * s_yy - s_y ** 2))
+
+
+def hitung_sentimen(per_skala):
+    """
+    Jumlah jawaban per kategori sentimen
+
+    Parameters:
+    - per_skala: Jumlah jawaban per skala (urutan mengikuti `scales`)
+
+    Returns:
+    - Array int64 berurutan `KATEGORI_SENTIMEN`
+    """
+    jumlah = np.zeros(len(KATEGORI_SENTIMEN), dtype=np.int64)
+    np.add.at(jumlah, kode_sentimen, np.asarray(per_skala, dtype=np.int64))
+    return jumlah
+
+
+def jawab(target_question, hitung, n):
+    """
+    Jawab satu pertanyaan q1–q13 dari matriks hitungan
+
+    Parameters:
+    - target_question: Kode pertanyaan ("q1" … "q13")
+    - hitung: Matriks hitungan (17, 6) hasil `hitung_matriks`
+    - n: Jumlah responden
+
+    Returns:
+    - Baris jawaban (kosong bila tidak ada jawaban sama sekali), atau None
+      jika kode pertanyaan tidak dikenal
+    """
+    per_skala = hitung.sum(axis=0)
+    total = per_skala.sum()
+
+    if target_question in daftar_pertanyaan and total == 0:
+        # Tidak ada jawaban sama sekali (mis. segmen baris kosong): jawaban kosong
+        return ""
+
+    # ================= q1 =================
+    if target_question == "q1":
+        j = int(np.argmax(per_skala))
+        jumlah = per_skala[j]
+        persen = round(jumlah / total * 100, 1)
+
+        return f"{scales[j]}|{jumlah}|{persen}"
+
+    # ================= q2 =================
+    elif target_question == "q2":
+        # Skala yang tidak pernah dipilih tidak ikut dibandingkan
+        j = int(np.argmin(np.where(per_skala > 0, per_skala, np.iinfo(np.int64).max)))
+        jumlah = per_skala[j]
+        persen = round(jumlah / total * 100, 1)
+
+        return f"{scales[j]}|{jumlah}|{persen}"
+
+    # ================= q3–q8 =================
+    elif target_question in skala_terbanyak:
+        kolom = hitung[:, scales.index(skala_terbanyak[target_question])]
+
+        i = int(np.argmax(kolom))
+        jumlah = kolom[i]
+        persen = jumlah / n * 100
+
+        if target_question in ("q7", "q8"):
+            # Format keluaran q7/q8 dipertahankan apa adanya
+            return f"{questions[i]}|8|{round(persen,1)}"
+        return f"{questions[i]}|{jumlah}|{round(persen,1)}"
+
+    # ================= q9 =================
+    elif target_question == "q9":
+        kolom = hitung[:, scales.index("STS")]
+
+        hasil = []
+        for q, count in zip(questions, kolom):
+            if count > 0:
+                persen = count / n * 100
+                hasil.append(f"{q}:{round(persen,1)}")
+
+        return "|".join(hasil)
+
+    # ================= q10 =================
+    elif target_question == "q10":
+        total_skor = (hitung @ bobot_skor).sum()
+        total_data = len(questions) * n
+
+        rata2 = total_skor / total_data
+        return f"{rata2:.2f}"
+
+    # ================= q11 =================
+    elif target_question == "q11":
+        rata2 = rata_rata_per_pertanyaan(hitung)
+
+        i = int(np.nanargmax(rata2))
+        return f"{questions[i]}:{rata2[i]:.2f}"
+
+    # ================= q12 =================
+    elif target_question == "q12":
+        rata2 = rata_rata_per_pertanyaan(hitung)
+
+        i = int(np.nanargmin(rata2))
+        return f"{questions[i]}:{rata2[i]:.2f}"
+
+    # ================= q13 =================
+    elif target_question == "q13":
+        negatif, netral, positif = hitung_sentimen(per_skala)
+
+        p_pos = round(positif/total*100,1)
+        p_net = round(netral/total*100,1)
+        p_neg = round(negatif/total*100,1)
+
+        return f"positif={positif}:{p_pos}|netral={netral}:{p_net}|negatif={negatif}:{p_neg}"
+
+    return None
@@ -0,0 +1,129 @@
+"""
+Mode layanan (resident) untuk menjawab pertanyaan q1–q13.
+
+Data kuesioner dimuat dan diagregasi sekali, lalu permintaan dijawab
+lewat protokol baris di stdin/stdout atau Unix socket. Data hanya
+dimuat ulang bila ukuran atau mtime workbook (atau state respons
+tambahannya) berubah di disk.
+
+Protokol: setiap baris masukan berisi satu kode pertanyaan (atau "all").
+Setiap kode dibalas tepat satu baris dengan format yang sama seperti
+answer.py; kode yang tidak dikenal dibalas baris kosong.
+"""
+import os
+import socketserver
+import sys
+import threading
+
+from kuesioner import daftar_pertanyaan, jawab
+from muat_kuesioner import agregasi_berkas, berkas_tambahan, tanda_berkas
+
+
+class Penjawab:
+    """
+    Menyimpan jawaban q1–q13 di memori dan memuat ulang saat workbook berubah
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._kunci = threading.Lock()
+        self._tanda = None
+        self._jawaban = {}
+        self.galat = None
+
+    def segarkan(self):
+        """
+        Muat ulang agregat bila workbook berubah sejak pemuatan terakhir
+
+        Kegagalan memuat ulang (mis. workbook sedang ditulis ulang dan
+        belum utuh) disimpan di `galat`; jawaban lama tetap dilayani dan
+        pemuatan dicoba lagi pada permintaan berikutnya.
+
+        Returns:
+        - Dict kode pertanyaan -> baris jawaban
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._tanda is None:
+                raise
+            # Workbook sedang diganti: layani data terakhir
+            return self._jawaban
+
+        tanda = (stat.st_size, stat.st_mtime_ns, tanda_berkas(berkas_tambahan(self.path)))
+        if tanda != self._tanda:
+            with self._kunci:
+                if tanda != self._tanda:
+                    try:
+                        hitung, n = agregasi_berkas(self.path)
+                    except Exception as e:
+                        if self._tanda is None:
+                            raise
+                        self.galat = e
+                        return self._jawaban
+                    self._jawaban = {
+                        q: jawab(q, hitung, n) for q in daftar_pertanyaan
+                    }
+                    self._tanda = tanda
+                    self.galat = None
+        return self._jawaban
+
+    def jawab_baris(self, baris):
+        """
+        Jawab satu baris permintaan
+
+        Parameters:
+        - baris: Kode pertanyaan atau "all"
+
+        Returns:
+        - List baris jawaban (satu per kode pertanyaan)
+        """
+        jawaban = self.segarkan()
+        baris = baris.strip()
+        if baris == "all":
+            return [jawaban[q] for q in daftar_pertanyaan]
+        return [jawaban.get(baris) or ""]
+
+
+def layani_stdio(penjawab, masuk=sys.stdin, keluar=sys.stdout):
+    """
+    Layani permintaan baris demi baris dari stdin sampai EOF
+    """
+    for baris in masuk:
+        if not baris.strip():
+            continue
+        keluar.write("\n".join(penjawab.jawab_baris(baris)) + "\n")
+        keluar.flush()
+
+
+class _PenanganSocket(socketserver.StreamRequestHandler):
+    def handle(self):
+        for baris in self.rfile:
+            baris = baris.decode("utf-8")
+            if not baris.strip():
+                continue
+            balasan = "\n".join(self.server.penjawab.jawab_baris(baris)) + "\n"
+            self.wfile.write(balasan.encode("utf-8"))
+            self.wfile.flush()
+
+
+def layani_socket(penjawab, alamat):
+    """
+    Layani permintaan lewat Unix socket di `alamat` sampai dihentikan
+
+    Parameters:
+    - penjawab: Objek `Penjawab`
+    - alamat: Lokasi berkas Unix socket
+    """
+    if os.path.exists(alamat):
+        os.remove(alamat)
+
+    with socketserver.ThreadingUnixStreamServer(alamat, _PenanganSocket) as server:
+        server.daemon_threads = True
+        server.penjawab = penjawab
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(alamat)
@@ -0,0 +1,612 @@
+"""
+Pemuatan data kuesioner dengan cache di samping workbook.
+
+Hasil parse `data_kuesioner.xlsx` disimpan dalam format kolumnar Parquet
+di folder `<workbook>.cache/`, bersama matriks kode int8 Q1–Q17 dan
+kamus label <-> kode (`kode.npz`). Cache dikunci dengan ukuran, mtime dan
+hash SHA-256 isi workbook, lalu dibangun ulang otomatis saat workbook
+berubah. Selama cache kode masih berlaku, modul ini hanya memakai NumPy;
+pandas dan openpyxl baru diimpor saat workbook harus di-parse ulang.
+
+Untuk workbook yang sangat besar tersedia jalur streaming
+(`agregasi_streaming`, `blok_kode_xlsx`, `blok_kode_csv`) yang membaca
+data per blok dengan memori tetap. Banyak workbook (per kelas/semester)
+dapat diagregasi paralel lewat `agregasi_banyak`.
+"""
+import glob
+import json
+import operator
+import os
+import warnings
+
+import numpy as np
+
+from cache_berkas import (
+    folder_cache,
+    hash_isi,
+    kunci_cache,
+    tanda_berkas,
+    tulis_atomik,
+    tulis_meta,
+)
+from kuesioner import (
+    KODE_KOSONG,
+    bobot_skor,
+    histogram_total,
+    hitung_matriks,
+    kode_nilai,
+    kodekan,
+    label_kode,
+    questions,
+    scales,
+    score_map,
+    statistik_lengkap,
+    tabel_silang,
+)
+
+DATA_FILE = "data_kuesioner.xlsx"
+
+# Versi format kode.npz; dinaikkan bila aturan pengodean berubah
+# (2: skor angka 1–6 ikut dikenali selain label;
+#  3: jumlah responden `n` disimpan terpisah dari matriks kode)
+VERSI_KODE = 3
+
+
+def _muat_frame(path, meta, valid):
+    # pandas baru diimpor di sini: jalur cache kode cukup memakai NumPy
+    import pandas as pd
+
+    folder = folder_cache(path)
+    berkas_data = os.path.join(folder, "data.parquet")
+
+    if valid:
+        try:
+            return pd.read_parquet(berkas_data)
+        except (OSError, ValueError):
+            pass
+
+    df = pd.read_excel(path)
+
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tulis_atomik(berkas_data, lambda tmp: df.to_parquet(tmp, index=False))
+    except (OSError, ValueError, TypeError):
+        # Kolom campuran yang tidak bisa disimpan kolumnar: frame tidak
+        # di-cache, dan sidecar lama (isi workbook sebelumnya) dibuang
+        try:
+            os.remove(berkas_data)
+        except OSError:
+            pass
+
+    # Meta tetap ditulis agar kode.npz (yang membawa sha256 sendiri) bisa
+    # dipakai walau sidecar frame tidak ada
+    try:
+        tulis_meta(folder, meta)
+    except OSError:
+        pass
+    return df
+
+
+def muat_kuesioner(path=DATA_FILE):
+    """
+    Muat data kuesioner, memakai cache Parquet bila masih berlaku
+
+    Parameters:
+    - path: Lokasi workbook kuesioner
+
+    Returns:
+    - DataFrame hasil parse workbook
+    """
+    meta, valid = kunci_cache(path)
+    return _muat_frame(path, meta, valid)
+
+
+def _kode_berlaku(data, meta):
+    return (
+        "versi" in data.files
+        and int(data["versi"]) == VERSI_KODE
+        and str(data["sha256"]) == meta["sha256"]
+    )
+
+
+def _muat_kode(path, meta, valid):
+    folder = folder_cache(path)
+    berkas_kode = os.path.join(folder, "kode.npz")
+
+    if valid:
+        try:
+            with np.load(berkas_kode, allow_pickle=False) as data:
+                # Pastikan kode dibangun dari isi workbook yang sama
+                if _kode_berlaku(data, meta):
+                    return data["kode"], data["label"]
+        except (OSError, KeyError, ValueError):
+            pass
+
+    kode = kodekan(_muat_frame(path, meta, valid))
+
+    def tulis(tmp):
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                kode=kode,
+                label=label_kode,
+                hitung=hitung_matriks(kode),
+                n=np.array(len(kode)),
+                sha256=np.array(meta["sha256"]),
+                versi=np.array(VERSI_KODE),
+            )
+
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tulis_atomik(berkas_kode, tulis)
+    except OSError:
+        pass
+    return kode, label_kode
+
+
+def muat_kode(path=DATA_FILE):
+    """
+    Muat jawaban Q1–Q17 sebagai matriks kode int8 (17 byte per responden)
+
+    Parameters:
+    - path: Lokasi workbook kuesioner
+
+    Returns:
+    - Tuple (kode, label); `kode` array int8 berukuran (n, 17) dan
+      `label` kamus kode -> label (indeks = kode, kode 0 = kosong)
+    """
+    meta, valid = kunci_cache(path)
+    return _muat_kode(path, meta, valid)
+
+
+def agregat_workbook(path=DATA_FILE):
+    """
+    Matriks hitungan workbook, dibaca dari cache tanpa memuat matriks kode
+
+    Returns:
+    - Tuple (hitung, n)
+    """
+    meta, valid = kunci_cache(path)
+
+    if valid:
+        try:
+            with np.load(os.path.join(folder_cache(path), "kode.npz"), allow_pickle=False) as data:
+                if _kode_berlaku(data, meta):
+                    return data["hitung"], int(data["n"])
+        except (OSError, KeyError, ValueError):
+            pass
+
+    kode, _ = _muat_kode(path, meta, valid)
+    return hitung_matriks(kode), len(kode)
+
+
+# =====================================================
+# RESPONS TAMBAHAN (APPEND)
+# =====================================================
+def berkas_tambahan(path):
+    """
+    Lokasi state agregat respons tambahan untuk sebuah workbook
+
+    Berkas ini bukan cache: isinya tidak bisa dibangun ulang dari workbook.
+    """
+    return f"{path}.tambahan.json"
+
+
+def _sha_workbook(path):
+    return hash_isi(path) if os.path.exists(path) else None
+
+
+def _state_basi(state, path):
+    """
+    True bila state dibuat untuk isi workbook lain (mis. workbook diganti
+    ekspor baru yang sudah memuat respons tambahan itu)
+    """
+    basis = state.get("workbook_sha256")
+    return basis is not None and basis != _sha_workbook(path)
+
+
+def _baca_state_tambahan(path):
+    try:
+        with open(berkas_tambahan(path), encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if _state_basi(state, path):
+        warnings.warn(
+            f"{berkas_tambahan(path)} dibuat untuk isi {path} yang lain; "
+            "respons tambahan diabaikan agar tidak terhitung dua kali"
+        )
+        return {}
+    return state
+
+
+def muat_tambahan(path=DATA_FILE):
+    """
+    Baca state agregat respons tambahan
+
+    Returns:
+    - Tuple (hitung, n); matriks nol bila belum ada respons tambahan
+    """
+    state = _baca_state_tambahan(path)
+    if not state:
+        return np.zeros((len(questions), len(score_map)), dtype=np.int64), 0
+    return np.array(state["hitung"], dtype=np.int64), int(state["n"])
+
+
+def muat_statistik_tambahan(path=DATA_FILE):
+    """
+    Baca statistik cukup respons tambahan untuk korelasi dan reliabilitas
+
+    State yang dibuat sebelum statistik ini ikut disimpan dianggap nol.
+
+    Returns:
+    - Tuple (silang, lengkap): tabel silang (119, 119) seperti
+      `kuesioner.tabel_silang` dan (n, jumlah, silang) seperti
+      `kuesioner.statistik_lengkap`
+    """
+    state = _baca_state_tambahan(path)
+    k = len(questions)
+    ukuran = k * (len(score_map) + 1)
+
+    if "silang" in state:
+        silang = np.array(state["silang"], dtype=np.int64)
+    else:
+        silang = np.zeros((ukuran, ukuran), dtype=np.int64)
+
+    if "lengkap" in state:
+        lengkap = state["lengkap"]
+        lengkap = (
+            int(lengkap["n"]),
+            np.array(lengkap["jumlah"], dtype=np.float64),
+            np.array(lengkap["silang"], dtype=np.float64),
+        )
+    else:
+        lengkap = (0, np.zeros(k), np.zeros((k, k)))
+    return silang, lengkap
+
+
+def muat_histogram_tambahan(path=DATA_FILE):
+    """
+    Baca histogram total skor per responden dari respons tambahan
+
+    Bersama `muat_tambahan`, cukup untuk bootstrap rata-rata (lihat
+    `kuesioner.bootstrap_rata_rata`) atas workbook dan respons tambahan.
+
+    Returns:
+    - Array int64 seperti `kuesioner.histogram_total`, atau None bila state
+      berisi respons yang ditambahkan sebelum histogram ikut disimpan
+    """
+    state = _baca_state_tambahan(path)
+    if "histogram" in state:
+        return np.array(state["histogram"], dtype=np.int64)
+    if state and int(state["n"]) > 0:
+        return None
+    return np.zeros(max(score_map.values()) * len(questions) + 1, dtype=np.int64)
+
+
+def validasi_respons(rows):
+    """
+    Ubah baris respons baru menjadi matriks kode, dengan validasi label
+
+    Parameters:
+    - rows: DataFrame berkolom Q1–Q17, list dict, atau list baris berisi
+      17 jawaban (label atau skor 1–6); sel kosong (None/NaN/"")
+      diperbolehkan
+
+    Returns:
+    - Matriks kode int8 berukuran (jumlah baris, 17)
+    """
+    import pandas as pd
+
+    if not isinstance(rows, pd.DataFrame):
+        rows = list(rows)
+        if rows and not isinstance(rows[0], dict):
+            rows = pd.DataFrame(rows, columns=questions)
+        else:
+            rows = pd.DataFrame(rows)
+
+    hilang = [q for q in questions if q not in rows.columns]
+    if hilang:
+        raise ValueError(f"Kolom tidak ditemukan: {', '.join(hilang)}")
+
+    nilai = rows[questions]
+    kosong = nilai.isna() | (nilai == "")
+    tidak_valid = ~(kosong | nilai.isin(list(kode_nilai)))
+    if tidak_valid.to_numpy().any():
+        baris, kolom = np.nonzero(tidak_valid.to_numpy())
+        contoh = [
+            f"baris {i + 1} {questions[j]}: {nilai.iat[i, j]!r}"
+            for i, j in zip(baris[:5], kolom[:5])
+        ]
+        raise ValueError(
+            f"{len(baris)} jawaban di luar skala {'/'.join(scales)} atau skor 1–6 "
+            f"({'; '.join(contoh)})"
+        )
+    return kodekan(nilai)
+
+
+def tambah_respons(rows, path=DATA_FILE):
+    """
+    Tambahkan respons baru ke state agregat tanpa menghitung ulang workbook
+
+    Waktu proses sebanding dengan jumlah baris baru: hanya batch yang
+    dikodekan dan dijumlahkan ke state tersimpan (hitungan per pertanyaan,
+    jumlah skor, histogram total skor per responden, serta statistik cukup
+    untuk korelasi dan reliabilitas).
+    State mencatat sha256 workbook yang ditambah; bila workbook sudah
+    berganti isi, state lama disisihkan ke `<state>.<sha>.lama` dan
+    penghitungan dimulai dari nol.
+
+    Parameters:
+    - rows: Respons baru (lihat `validasi_respons`)
+    - path: Lokasi workbook yang ditambah
+
+    Returns:
+    - Tuple (hitung, n) state tambahan setelah batch dimasukkan
+    """
+    import fcntl
+
+    kode = validasi_respons(rows)
+    hitung_batch = hitung_matriks(kode)
+
+    berkas = berkas_tambahan(path)
+    with open(f"{berkas}.lock", "w") as kunci:
+        # Satu penulis pada satu waktu agar batch tidak saling menimpa
+        fcntl.flock(kunci, fcntl.LOCK_EX)
+
+        try:
+            with open(berkas, encoding="utf-8") as f:
+                lama = json.load(f)
+        except FileNotFoundError:
+            lama = {}
+        if _state_basi(lama, path):
+            os.replace(berkas, f"{berkas}.{lama['workbook_sha256'][:12]}.lama")
+
+        hitung, n = muat_tambahan(path)
+        hitung = hitung + hitung_batch
+        n += len(kode)
+
+        silang, (n_lengkap, jumlah, silang_lengkap) = muat_statistik_tambahan(path)
+        silang = silang + tabel_silang(kode)
+        n_batch, jumlah_batch, silang_batch = statistik_lengkap(kode)
+        histogram = muat_histogram_tambahan(path)
+
+        state = {
+            "hitung": hitung.tolist(),
+            "skor": (hitung @ bobot_skor).tolist(),
+            "silang": silang.tolist(),
+            "lengkap": {
+                "n": n_lengkap + n_batch,
+                "jumlah": (jumlah + jumlah_batch).tolist(),
+                "silang": (silang_lengkap + silang_batch).tolist(),
+            },
+            "n": n,
+            "workbook_sha256": _sha_workbook(path),
+        }
+        if histogram is not None:
+            # State lama tanpa histogram tidak bisa dilengkapi lagi
+            state["histogram"] = (histogram + histogram_total(kode)).tolist()
+
+        def tulis(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+
+        tulis_atomik(berkas, tulis)
+    return hitung, n
+
+
+def _baris_kosong(baris):
+    return all(v is None or v == "" for v in baris)
+
+
+def blok_kode_xlsx(sumber, ukuran_blok=65536):
+    """
+    Baca sheet kuesioner baris demi baris sebagai blok kode int8
+
+    Workbook dibuka dalam mode read-only dan baris dikodekan ke buffer
+    berukuran tetap. Baris kosong di tengah sheet menjadi baris tanpa
+    jawaban, sedangkan baris kosong di akhir sheet diabaikan seperti pada
+    `pd.read_excel`.
+
+    Parameters:
+    - sumber: Lokasi workbook atau objek berkas (mis. hasil unggahan)
+    - ukuran_blok: Jumlah baris per blok
+
+    Yields:
+    - Array int8 berukuran (≤ ukuran_blok, 17). Buffer yang sama dipakai
+      ulang untuk blok berikutnya; salin bila blok perlu disimpan.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(sumber, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        ws.reset_dimensions()
+        baris_iter = ws.iter_rows(values_only=True)
+
+        header = list(next(baris_iter, ()))
+        for q in questions:
+            if q not in header:
+                raise KeyError(f"Kolom {q} tidak ditemukan")
+        ambil = operator.itemgetter(*(header.index(q) for q in questions))
+        lebar = len(header)
+
+        buffer = np.full((ukuran_blok, len(questions)), KODE_KOSONG, dtype=np.int8)
+        terisi = 0
+        kosong_tertunda = 0
+
+        for baris in baris_iter:
+            if _baris_kosong(baris):
+                # Baru dihitung bila masih ada baris berisi sesudahnya
+                kosong_tertunda += 1
+                continue
+
+            for _ in range(kosong_tertunda):
+                buffer[terisi] = KODE_KOSONG
+                terisi += 1
+                if terisi == ukuran_blok:
+                    yield buffer
+                    terisi = 0
+            kosong_tertunda = 0
+
+            if len(baris) < lebar:
+                baris = tuple(baris) + (None,) * (lebar - len(baris))
+            buffer[terisi] = [kode_nilai.get(v, KODE_KOSONG) for v in ambil(baris)]
+            terisi += 1
+            if terisi == ukuran_blok:
+                yield buffer
+                terisi = 0
+
+        if terisi:
+            yield buffer[:terisi]
+    finally:
+        wb.close()
+
+
+def blok_kode_csv(sumber, ukuran_blok=65536):
+    """
+    Baca CSV kuesioner per potongan (chunk) sebagai blok kode int8
+
+    Hanya kolom Q1–Q17 yang dibaca; setiap potongan langsung dikodekan
+    (label maupun skor angka) sehingga isi mentah tidak pernah tersimpan
+    untuk seluruh berkas.
+
+    Parameters:
+    - sumber: Lokasi CSV atau objek berkas
+    - ukuran_blok: Jumlah baris per potongan
+
+    Yields:
+    - Array int8 berukuran (≤ ukuran_blok, 17)
+    """
+    import pandas as pd
+
+    for potongan in pd.read_csv(sumber, usecols=questions, chunksize=ukuran_blok):
+        yield kodekan(potongan)
+
+
+def kode_dari_blok(blok_iter, batas_baris=None, sampel=False, seed=0):
+    """
+    Kumpulkan blok kode menjadi satu matriks dengan batas jumlah baris
+
+    Parameters:
+    - blok_iter: Iterable blok kode int8 (mis. `blok_kode_xlsx`)
+    - batas_baris: Jumlah responden maksimum yang disimpan (None = tanpa batas)
+    - sampel: Bila True, data yang melebihi batas diambil sampel acak
+      seragam (reservoir sampling); bila False, ValueError
+    - seed: Seed sampel agar hasil bisa diulang
+
+    Returns:
+    - Tuple (kode, n); `kode` matriks int8 (≤ batas_baris, 17) dan `n`
+      jumlah responden yang dibaca
+    """
+    rng = np.random.default_rng(seed)
+    kumpulan = []
+    reservoir = None
+    n = 0
+
+    for blok in blok_iter:
+        if reservoir is None:
+            if batas_baris is None or n + len(blok) <= batas_baris:
+                kumpulan.append(blok.copy())
+                n += len(blok)
+                continue
+            if not sampel:
+                raise ValueError(
+                    f"Data melebihi batas memori ({batas_baris:,} responden × "
+                    f"{len(questions)} byte)"
+                )
+            sisa = batas_baris - n
+            reservoir = np.concatenate(kumpulan + [blok[:sisa]])
+            kumpulan = None
+            blok = blok[sisa:]
+            n = batas_baris
+
+        # Algoritma R: baris ke-g (1-based) menggantikan isi reservoir
+        # dengan peluang batas_baris / g
+        g = np.arange(n + 1, n + len(blok) + 1)
+        r = rng.integers(0, g)
+        pilih = r < batas_baris
+        reservoir[r[pilih]] = blok[pilih]
+        n += len(blok)
+
+    if reservoir is not None:
+        return reservoir, n
+    if not kumpulan:
+        return np.empty((0, len(questions)), dtype=np.int8), 0
+    return np.concatenate(kumpulan), n
+
+
+def agregasi_streaming(path=DATA_FILE, ukuran_blok=65536):
+    """
+    Hitung matriks pertanyaan × skala langsung dari sheet, baris demi baris
+
+    Blok dari `blok_kode_xlsx` dijumlahkan ke matriks hitungan satu per
+    satu, sehingga memori puncak tidak bergantung pada jumlah responden
+    dan hasilnya sama persis dengan jalur in-memory.
+
+    Parameters:
+    - path: Lokasi workbook kuesioner
+    - ukuran_blok: Jumlah baris per buffer
+
+    Returns:
+    - Tuple (hitung, n); `hitung` matriks (17, 6) dan `n` jumlah responden
+    """
+    hitung = np.zeros((len(questions), len(score_map)), dtype=np.int64)
+    n = 0
+    for blok in blok_kode_xlsx(path, ukuran_blok):
+        hitung += hitung_matriks(blok)
+        n += len(blok)
+    return hitung, n
+
+
+def daftar_workbook(pola):
+    """
+    Kumpulkan workbook dari sebuah folder atau pola glob
+
+    Parameters:
+    - pola: Lokasi folder (semua *.xlsx di dalamnya) atau pola glob
+
+    Returns:
+    - List lokasi workbook, terurut
+    """
+    if os.path.isdir(pola):
+        pola = os.path.join(pola, "*.xlsx")
+    return sorted(
+        p for p in glob.glob(pola)
+        if os.path.isfile(p) and not os.path.basename(p).startswith("~$")
+    )
+
+
+def agregasi_berkas(path, streaming=False):
+    """
+    Reduksi satu workbook (ditambah respons tambahannya) menjadi matriks hitungan
+
+    Returns:
+    - Tuple (hitung, n)
+    """
+    if streaming:
+        hitung, n = agregasi_streaming(path)
+    else:
+        hitung, n = agregat_workbook(path)
+    hitung_tambahan, n_tambahan = muat_tambahan(path)
+    return hitung + hitung_tambahan, n + n_tambahan
+
+
+def agregasi_banyak(paths, streaming=False, max_workers=None):
+    """
+    Reduksi banyak workbook secara paralel di process pool
+
+    Parameters:
+    - paths: List lokasi workbook
+    - streaming: Pakai `agregasi_streaming` untuk tiap workbook
+    - max_workers: Jumlah proses (default: jumlah core)
+
+    Returns:
+    - List tuple (hitung, n) sesuai urutan `paths`
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if len(paths) <= 1:
+        return [agregasi_berkas(p, streaming) for p in paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(agregasi_berkas, paths, [streaming] * len(paths)))
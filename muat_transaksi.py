@@ -0,0 +1,745 @@
+"""
+Pemuatan data transaksi ITDel Tech (`itdeltech_2025.csv`) dengan cache kolumnar.
+
+CSV di-parse dan dibersihkan sekali (kolom uang, kolom kalender turunan,
+dimensi sebagai kategori), lalu hasilnya disimpan sebagai Parquet
+terkompresi yang dipartisi per bulan di folder `<csv>.cache/bagian/`.
+Selama ukuran, mtime atau hash isi CSV tidak berubah, pemuatan berikutnya
+langsung membaca partisi dengan tipe data yang sudah benar: tanggal
+sebagai datetime, angka sebagai numerik, dan dimensi terkode kamus
+(dictionary encoding). Rentang tanggal hanya membuka partisi bulan yang
+beririsan dan hanya membaca kolom yang diminta.
+"""
+import os
+import re
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+from cache_berkas import (
+    baca_meta,
+    folder_cache,
+    hash_isi,
+    kunci_cache,
+    tanda_berkas,
+    tulis_atomik,
+    tulis_meta,
+)
+
+DATA_FILE = "itdeltech_2025.csv"
+
+# Kolom yang berisi data uang (teks Rupiah atau angka)
+KOLOM_UANG = ["unit_price", "sales_qty", "revenue", "cost", "profit"]
+
+# Kolom uang yang disimpan eksak sebagai sen int64; sales_qty adalah
+# jumlah unit (int64 bulat)
+KOLOM_RUPIAH = ["unit_price", "revenue", "cost", "profit"]
+
+# Kolom dimensi (disimpan sebagai kategori / terkode kamus)
+KOLOM_DIMENSI = ["city", "category", "channel", "product_name", "customer_type"]
+
+# Jumlah nomor baris sel tidak valid yang dicatat per kolom
+MAKS_CONTOH_BARIS = 20
+
+
+def _byte_teks(nilai):
+    # Teks ASCII langsung menjadi matriks byte; selain itu (mis. spasi
+    # tak-putus) diganti dulu agar karakter asing tetap terdeteksi tidak valid
+    try:
+        b = np.asarray(nilai, dtype="S")
+    except UnicodeEncodeError:
+        b = np.array([v.replace("\xa0", " ").encode("ascii", "replace") for v in nilai], dtype="S")
+    if b.dtype.itemsize == 0:
+        b = b.astype("S1")
+    return b.view(np.uint8).reshape(len(b), b.dtype.itemsize)
+
+
+def parse_rupiah(nilai, ukuran_blok=1 << 16):
+    """
+    Parse teks uang format Indonesia ("Rp 1.234.567,89") menjadi sen int64
+
+    Setiap blok teks diubah menjadi satu matriks byte lalu diperiksa dan
+    dijumlahkan per digit dalam satu lintasan vektor, tanpa salinan string
+    perantara. Format yang diterima: awalan "Rp" (boleh diikuti satu
+    titik, "Rp.") dan tanda minus opsional sebelum angka, titik pemisah
+    ribuan (kelompok tiga digit), dan koma desimal dengan paling banyak
+    dua digit sen.
+
+    Parameters:
+    - nilai: Series atau array teks (NaN/None dianggap kosong)
+    - ukuran_blok: Jumlah sel per blok matriks byte
+
+    Returns:
+    - Tuple (sen, kosong, tidak_valid): array int64 nilai dalam sen (0 pada
+      sel kosong atau tidak valid), mask sel kosong, dan mask sel yang
+      tidak bisa di-parse
+
+    Contoh masukan yang diterima dan ditolak (diperiksa dengan
+    `python -m doctest muat_transaksi.py`):
+
+    >>> contoh = [
+    ...     "Rp 1.234.567,89", "Rp -4.500,50", "Rp1.000", "-Rp 750", "1.000",
+    ...     "12", " 7 ", "Rp 1.000,5", "", None, "Rp 1.23", "1,234", "1.0000",
+    ...     "12.34.567", "Rp 12 345", "--5", "5 Rp", "Rp 1,234", "Rp 1.2x3",
+    ...     "RP 100", "Rp. 1.000", "Rp.1.000,50", "Rp.. 1.000", "Rp 1.000.",
+    ... ]
+    >>> sen, kosong, tidak_valid = parse_rupiah(contoh)
+    >>> for teks, s, k, t in zip(contoh, sen, kosong, tidak_valid):
+    ...     print(f"{teks!r:>18} -> {'kosong' if k else 'tidak valid' if t else s}")
+     'Rp 1.234.567,89' -> 123456789
+        'Rp -4.500,50' -> -450050
+             'Rp1.000' -> 100000
+             '-Rp 750' -> -75000
+               '1.000' -> 100000
+                  '12' -> 1200
+                 ' 7 ' -> 700
+          'Rp 1.000,5' -> 100050
+                    '' -> kosong
+                  None -> kosong
+             'Rp 1.23' -> tidak valid
+               '1,234' -> tidak valid
+              '1.0000' -> tidak valid
+           '12.34.567' -> tidak valid
+           'Rp 12 345' -> tidak valid
+                 '--5' -> tidak valid
+                '5 Rp' -> tidak valid
+            'Rp 1,234' -> tidak valid
+            'Rp 1.2x3' -> tidak valid
+              'RP 100' -> tidak valid
+           'Rp. 1.000' -> 100000
+         'Rp.1.000,50' -> 100050
+          'Rp.. 1.000' -> tidak valid
+           'Rp 1.000.' -> tidak valid
+    """
+    nilai = np.asarray(nilai, dtype=object)
+    kosong_awal = pd.isna(nilai)
+    nilai = np.where(kosong_awal, "", nilai)
+
+    n = len(nilai)
+    sen = np.zeros(n, dtype=np.int64)
+    kosong = np.zeros(n, dtype=bool)
+    ok = np.zeros(n, dtype=bool)
+
+    for awal in range(0, n, ukuran_blok):
+        akhir = min(awal + ukuran_blok, n)
+        c = _byte_teks(nilai[awal:akhir])
+        kolom = np.arange(c.shape[1])
+
+        digit = (c >= ord("0")) & (c <= ord("9"))
+        titik = c == ord(".")
+        koma = c == ord(",")
+        minus = c == ord("-")
+        huruf_r = c == ord("R")
+        huruf_p = c == ord("p")
+        spasi = (c == ord(" ")) | (c == ord("\t")) | (c == 0)
+        kosong_blok = spasi.all(axis=1)
+
+        digit_awal = np.argmax(digit, axis=1)[:, None]
+        # Satu titik boleh tepat setelah "Rp" ("Rp. 1.000"), sebelum angka;
+        # titik ini bukan pemisah ribuan
+        titik_rp = titik & np.roll(huruf_p, 1, axis=1) & (kolom < digit_awal)
+        titik &= ~titik_rp
+        digit_akhir = c.shape[1] - 1 - np.argmax(digit[:, ::-1], axis=1)[:, None]
+        posisi_koma = np.where(koma.any(axis=1), np.argmax(koma, axis=1), c.shape[1])[:, None]
+        di_dalam = (kolom > digit_awal) & (kolom < digit_akhir)
+        bulat = digit & (kolom < posisi_koma)
+        pecahan = digit & (kolom > posisi_koma)
+
+        # Jumlah digit bulat di kanan tiap posisi, dan urutan titik dari kanan
+        sisa = np.cumsum(bulat[:, ::-1], axis=1, dtype=np.int16)[:, ::-1] - bulat
+        urutan_titik = np.cumsum(titik[:, ::-1], axis=1, dtype=np.int16)[:, ::-1]
+
+        # Semua pelanggaran per byte digabung, lalu direduksi sekali
+        salah = ~(digit | titik | titik_rp | koma | minus | huruf_r | huruf_p | spasi)
+        # "Rp" dan minus hanya sebelum angka; "p" tepat setelah "R"
+        salah |= (huruf_r | huruf_p | minus) & (kolom >= digit_awal)
+        salah |= np.roll(huruf_r, 1, axis=1) != huruf_p
+        # Spasi tidak boleh memotong angka; titik dan koma hanya di antara digit
+        salah |= spasi & di_dalam
+        salah |= (titik | koma) & ~di_dalam
+        # Titik hanya di bagian bulat; titik ke-k dari kanan diikuti tepat 3k digit
+        salah |= titik & ((kolom > posisi_koma) | (sisa != 3 * urutan_titik))
+
+        n_bulat = bulat.sum(axis=1)
+        n_titik = titik.sum(axis=1)
+        depan = n_bulat - 3 * n_titik
+        baik = (
+            ~salah.any(axis=1)
+            & digit.any(axis=1)
+            & (huruf_r.sum(axis=1) <= 1)
+            & (minus.sum(axis=1) <= 1)
+            & (koma.sum(axis=1) <= 1)
+            & (n_bulat <= 16)
+            & (pecahan.sum(axis=1) <= 2)
+            & ((n_titik == 0) | ((depan >= 1) & (depan <= 3)))
+        )
+
+        # Nilai dihitung kolom demi kolom (Horner): rupiah = rupiah × 10 + digit
+        angka = c.astype(np.int64) - ord("0")
+        rupiah = np.zeros(len(c), dtype=np.int64)
+        sen_blok = np.zeros(len(c), dtype=np.int64)
+        bobot = np.where(pecahan, np.where(np.cumsum(pecahan, axis=1) == 1, 10, 1), 0)
+        for j in range(c.shape[1]):
+            rupiah = np.where(bulat[:, j], rupiah * 10 + angka[:, j], rupiah)
+            sen_blok += np.where(pecahan[:, j], angka[:, j] * bobot[:, j], 0)
+        hasil = rupiah * 100 + sen_blok
+        hasil = np.where(minus.any(axis=1), -hasil, hasil)
+
+        sen[awal:akhir] = np.where(baik, hasil, 0)
+        ok[awal:akhir] = baik
+        kosong[awal:akhir] = kosong_blok
+
+    kosong |= kosong_awal
+    return sen, kosong, ~ok & ~kosong
+
+
+def _sen_kolom(nilai):
+    """
+    Nilai sen satu kolom uang, baik berupa teks Rupiah maupun angka
+
+    Returns:
+    - Tuple (sen, kosong, tidak_valid) seperti `parse_rupiah`
+    """
+    if nilai.dtype == "object":
+        return parse_rupiah(nilai)
+
+    kosong = nilai.isna().to_numpy()
+    if pd.api.types.is_integer_dtype(nilai.dtype) and not kosong.any():
+        return nilai.to_numpy(dtype=np.int64) * 100, kosong, np.zeros(len(nilai), dtype=bool)
+
+    angka = pd.to_numeric(nilai, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    tidak_valid = ~np.isfinite(angka) & ~kosong
+    sen = np.where(np.isfinite(angka), np.round(angka * 100), 0).astype(np.int64)
+    return sen, kosong, tidak_valid
+
+
+def _kolom_bilangan(nilai, hilang):
+    """
+    Kolom Int64 nullable: nilai eksak, sel kosong atau tidak valid menjadi <NA>
+    """
+    return pd.arrays.IntegerArray(np.where(hilang, 0, nilai), hilang.copy())
+
+
+def tambah_kolom_turunan(df):
+    """
+    Tambahkan kolom kalender dan profit margin (bila belum ada)
+    """
+    # Ekstrak informasi bulan
+    df["bulan"] = df["date"].dt.month
+    df["nama_bulan"] = df["date"].dt.strftime("%B")
+    df["tahun"] = df["date"].dt.year
+    df["hari"] = df["date"].dt.day
+    df["minggu"] = df["date"].dt.isocalendar().week
+
+    # Hitung profit margin jika tidak ada
+    if "profit_margin" not in df.columns:
+        df["profit_margin"] = (df["profit"] / df["revenue"] * 100).round(2)
+
+    return df
+
+
+def bersihkan(df, baris_awal=0):
+    """
+    Bersihkan dan lengkapi DataFrame transaksi hasil `pd.read_csv`
+
+    Parameters:
+    - df: DataFrame mentah dengan kolom `date` bertipe datetime
+    - baris_awal: Jumlah baris data sebelum `df` di CSV (untuk potongan)
+
+    Returns:
+    - DataFrame yang sama setelah kolom uang, kalender, dan kategori diolah.
+      Kolom `KOLOM_RUPIAH` berisi sen sebagai Int64 nullable (eksak, tanpa
+      pembulatan float) dan `sales_qty` berisi unit Int64. Sel yang tidak
+      bisa di-parse (termasuk jumlah unit pecahan) menjadi <NA> dan
+      dilaporkan di `df.attrs["sel_tidak_valid"]`: kolom -> {"jumlah",
+      "baris"} dengan nomor baris CSV (baris 1 = header)
+    """
+    # Konversi kolom uang ke bilangan bulat eksak
+    laporan = {}
+    for kolom in KOLOM_UANG:
+        if kolom in df.columns:
+            sen, kosong, tidak_valid = _sen_kolom(df[kolom])
+            if kolom in KOLOM_RUPIAH:
+                nilai = sen
+            else:
+                tidak_valid |= (sen % 100 != 0) & ~kosong
+                nilai = sen // 100
+            if tidak_valid.any():
+                baris = np.flatnonzero(tidak_valid)
+                laporan[kolom] = {
+                    "jumlah": len(baris),
+                    "baris": (baris[:MAKS_CONTOH_BARIS] + baris_awal + 2).tolist(),
+                }
+            df[kolom] = _kolom_bilangan(nilai, kosong | tidak_valid)
+    df.attrs["sel_tidak_valid"] = laporan
+
+    # Optimasi memori dengan tipe data kategori
+    for kolom in KOLOM_DIMENSI:
+        if kolom in df.columns:
+            df[kolom] = df[kolom].astype("category")
+
+    return tambah_kolom_turunan(df)
+
+
+# =====================================================
+# INGESTI BERTAHAP & PARTISI PER BULAN
+# =====================================================
+# Versi format keluaran ingesti bertahap
+# (2: bagian Parquet dipartisi per bulan, ringkasan disimpan di meta;
+#  3: folder partisi berversi per sha256 CSV;
+#  4: kolom uang disimpan sebagai sen int64;
+#  5: awalan "Rp." diterima)
+VERSI_BERTAHAP = 5
+
+# Jumlah baris CSV per potongan
+UKURAN_POTONGAN = 500_000
+
+# Kunci agregat harian
+KUNCI_HARIAN = ["date"] + KOLOM_DIMENSI
+
+# Nama kolom partisi Hive (nilai "YYYY-MM"); sengaja bukan "bulan" karena
+# nama itu sudah dipakai kolom kalender
+KOLOM_PARTISI = "periode"
+
+
+def _nama_bagian(sha256):
+    """
+    Nama folder partisi untuk satu isi CSV dan satu versi format
+    """
+    return f"bagian-v{VERSI_BERTAHAP}-{sha256[:16]}"
+
+
+def hapus_partisi_lama(path=DATA_FILE, simpan=()):
+    """
+    Hapus folder partisi versi lain selain yang ada di `simpan`
+
+    Dipanggil setelah ringkasan baru ditukar masuk, bukan saat ingesti,
+    agar pembaca yang masih memegang ringkasan lama tidak kehilangan
+    berkasnya di tengah pemindaian.
+
+    Parameters:
+    - path: Lokasi CSV transaksi
+    - simpan: Nama folder partisi yang dipertahankan
+    """
+    folder = folder_cache(path)
+    if not os.path.isdir(folder):
+        return
+    for nama in os.listdir(folder):
+        if nama in simpan:
+            continue
+        # Hanya folder partisi jadi (termasuk tata letak lama `bagian`),
+        # bukan folder sementara ingesti lain yang sedang berjalan
+        if nama == "bagian" or re.fullmatch(r"bagian-v\d+-[0-9a-f]{16}", nama):
+            shutil.rmtree(os.path.join(folder, nama), ignore_errors=True)
+
+
+def _skema_tetap(tabel):
+    """
+    Skema Arrow yang sama untuk semua potongan: dimensi terkode kamus
+    berindeks int32, kolom uang (sen) dan unit sebagai int64 dengan null,
+    dan kolom rasio sebagai float64, sehingga potongan dengan kamus atau
+    tipe hasil inferensi berbeda tetap bisa digabung
+    """
+    import pyarrow as pa
+
+    field = []
+    for f in tabel.schema:
+        if pa.types.is_dictionary(f.type):
+            f = f.with_type(pa.dictionary(pa.int32(), pa.string()))
+        elif f.name in KOLOM_UANG:
+            f = f.with_type(pa.int64())
+        elif f.name in ("discount", "profit_margin"):
+            f = f.with_type(pa.float64())
+        field.append(f)
+    return pa.schema(field, metadata=tabel.schema.metadata)
+
+
+def _agregat_potongan(df):
+    """
+    Agregat harian satu potongan berupa jumlah dan cacah (bisa digabung)
+    """
+    ukuran = {"jumlah_transaksi": ("date", "size")}
+    for kolom in ["sales_qty", "revenue", "cost", "profit"]:
+        if kolom in df.columns:
+            ukuran[kolom] = (kolom, "sum")
+    # Rata-rata disimpan sebagai jumlah dan cacah agar tetap eksak setelah digabung
+    for kolom in ["unit_price", "discount"]:
+        if kolom in df.columns:
+            ukuran[f"{kolom}_jumlah"] = (kolom, "sum")
+            ukuran[f"{kolom}_n"] = (kolom, "count")
+
+    kunci = [k for k in KUNCI_HARIAN if k in df.columns]
+    # dropna=False: transaksi dengan dimensi atau tanggal kosong tetap dihitung
+    return df.groupby(kunci, observed=True, sort=False, dropna=False).agg(**ukuran).reset_index()
+
+
+def _gabung_laporan(laporan, tambahan):
+    for kolom, info in tambahan.items():
+        lama = laporan.setdefault(kolom, {"jumlah": 0, "baris": []})
+        lama["jumlah"] += info["jumlah"]
+        lama["baris"] = (lama["baris"] + info["baris"])[:MAKS_CONTOH_BARIS]
+
+
+def _tulis_per_bulan(tabel, tanggal, folder, nama):
+    """
+    Tulis satu potongan sebagai satu berkas per bulan yang dikandungnya
+
+    Parameters:
+    - tabel: Tabel Arrow potongan (sudah dalam skema tetap)
+    - tanggal: Series datetime kolom `date` potongan yang sama
+    - folder: Folder akar partisi
+    - nama: Nama berkas di dalam setiap folder `periode=YYYY-MM`
+    """
+    import pyarrow.parquet as pq
+
+    kode = (tanggal.dt.year * 100 + tanggal.dt.month).to_numpy()
+    for k in pd.unique(kode):
+        if pd.isna(k):
+            mask, label = np.isnan(kode), "tanpa-tanggal"
+        else:
+            mask, label = kode == k, f"{int(k) // 100:04d}-{int(k) % 100:02d}"
+        subfolder = os.path.join(folder, f"{KOLOM_PARTISI}={label}")
+        os.makedirs(subfolder, exist_ok=True)
+        pq.write_table(
+            tabel.filter(mask),
+            os.path.join(subfolder, nama),
+            compression="zstd"
+        )
+
+
+def _ringkasan(harian, skema, laporan, bagian):
+    """
+    Ringkasan isi penyimpanan untuk meta.json: folder partisi, rentang
+    tanggal, nilai tiap dimensi, dan daftar kolom, agar filter bisa
+    dibangun tanpa membaca data
+    """
+    tanggal = harian["date"].dropna() if "date" in harian.columns else pd.Series(dtype="datetime64[ns]")
+    return {
+        "bagian": bagian,
+        "tanggal_min": None if tanggal.empty else tanggal.min().date().isoformat(),
+        "tanggal_max": None if tanggal.empty else tanggal.max().date().isoformat(),
+        "dimensi": {
+            kolom: sorted(map(str, harian[kolom].dropna().unique()))
+            for kolom in KOLOM_DIMENSI if kolom in harian.columns
+        },
+        "kolom": [] if skema is None else list(skema.names),
+        "sel_tidak_valid": laporan,
+    }
+
+
+def ingest_bertahap(path=DATA_FILE, ukuran_potongan=UKURAN_POTONGAN):
+    """
+    Ingesti CSV transaksi per potongan tanpa memuat seluruh berkas
+
+    Setiap potongan dibaca, dibersihkan dan diberi tipe seperti
+    `bersihkan`, lalu ditulis sebagai bagian Parquet yang dipartisi per
+    bulan di `<csv>.cache/bagian-v<versi>-<sha256>/periode=YYYY-MM/` dan
+    direduksi menjadi
+    agregat harian per (date, city, category, product_name, channel,
+    customer_type). Memori puncak sebanding dengan ukuran potongan dan
+    jumlah grup harian, bukan dengan ukuran CSV.
+
+    Parameters:
+    - path: Lokasi CSV transaksi
+    - ukuran_potongan: Jumlah baris per potongan
+
+    Returns:
+    - Tuple (harian, ringkasan): DataFrame agregat harian (lihat
+      `muat_harian`) dan dict ringkasan yang juga disimpan di meta.json
+    """
+    import pyarrow as pa
+
+    meta, _ = kunci_cache(path)
+    folder = folder_cache(path)
+    os.makedirs(folder, exist_ok=True)
+
+    # Setiap isi CSV mendapat folder sendiri: folder versi lain tidak
+    # disentuh, sehingga pembaca ringkasan lama tetap membaca data lama
+    bagian = _nama_bagian(meta["sha256"])
+    tujuan = os.path.join(folder, bagian)
+    sementara = f"{tujuan}.{os.getpid()}.tmp"
+    shutil.rmtree(sementara, ignore_errors=True)
+    os.makedirs(sementara)
+
+    skema = None
+    parsial = []
+    laporan = {}
+    baris_awal = 0
+    try:
+        potongan_iter = pd.read_csv(path, parse_dates=["date"], chunksize=ukuran_potongan)
+        for i, potongan in enumerate(potongan_iter):
+            potongan = bersihkan(potongan, baris_awal=baris_awal)
+            _gabung_laporan(laporan, potongan.attrs["sel_tidak_valid"])
+            baris_awal += len(potongan)
+
+            tabel = pa.Table.from_pandas(potongan, preserve_index=False)
+            if skema is None:
+                skema = _skema_tetap(tabel)
+            _tulis_per_bulan(tabel.cast(skema), potongan["date"], sementara, f"bagian-{i:05d}.parquet")
+            parsial.append(_agregat_potongan(potongan))
+
+        if not os.path.exists(tujuan):
+            os.replace(sementara, tujuan)
+        # Bila sudah ada, isinya sama (nama memuat sha256 dan versi format)
+    finally:
+        shutil.rmtree(sementara, ignore_errors=True)
+
+    if parsial:
+        gabungan = pd.concat(parsial, ignore_index=True)
+        kunci = [k for k in KUNCI_HARIAN if k in gabungan.columns]
+        harian = gabungan.groupby(kunci, observed=True, dropna=False).sum().reset_index()
+    else:
+        harian = pd.DataFrame(columns=KUNCI_HARIAN + ["jumlah_transaksi"])
+    for kolom in KOLOM_DIMENSI:
+        if kolom in harian.columns:
+            harian[kolom] = harian[kolom].astype("category")
+    harian.attrs["sel_tidak_valid"] = laporan
+
+    tulis_atomik(
+        os.path.join(folder, "harian.parquet"),
+        lambda tmp: harian.to_parquet(tmp, index=False, compression="zstd")
+    )
+    ringkasan = _ringkasan(harian, skema, laporan, bagian)
+    tulis_meta(folder, {**meta, "versi_bertahap": VERSI_BERTAHAP, "ringkasan": ringkasan})
+    return harian, ringkasan
+
+
+def siapkan_partisi(path=DATA_FILE, ukuran_potongan=UKURAN_POTONGAN):
+    """
+    Pastikan penyimpanan terpartisi sesuai dengan isi CSV saat ini
+
+    Ingesti bertahap hanya dijalankan bila CSV berubah sejak ingesti
+    terakhir; selain itu cukup membaca meta.json.
+
+    Parameters:
+    - path: Lokasi CSV transaksi
+    - ukuran_potongan: Jumlah baris per potongan saat ingesti
+
+    Returns:
+    - Dict ringkasan (bagian, tanggal_min, tanggal_max, dimensi, kolom,
+      sel_tidak_valid) ditambah sha256 CSV
+    """
+    meta, valid = kunci_cache(path)
+    if valid and meta.get("versi_bertahap") == VERSI_BERTAHAP and "ringkasan" in meta:
+        ringkasan = meta["ringkasan"]
+    else:
+        _, ringkasan = ingest_bertahap(path, ukuran_potongan)
+    return {**ringkasan, "sha256": meta["sha256"]}
+
+
+def muat_rentang(path=DATA_FILE, awal=None, akhir=None, kolom=None, saring=None, bagian=None):
+    """
+    Muat baris transaksi dalam rentang tanggal dari penyimpanan terpartisi
+
+    Hanya partisi bulan yang beririsan dengan [awal, akhir] yang dibuka,
+    dan hanya `kolom` yang diminta yang dibaca dari Parquet; filter
+    tanggal dan `saring` dievaluasi di lapisan penyimpanan sebelum
+    menjadi DataFrame. Waktu muat sebanding dengan jumlah baris terpilih,
+    bukan dengan panjang riwayat. Penyimpanan harus sudah disiapkan
+    dengan `siapkan_partisi`.
+
+    Parameters:
+    - path: Lokasi CSV transaksi
+    - awal: Tanggal awal (inklusif), None berarti tanpa batas
+    - akhir: Tanggal akhir (inklusif), None berarti tanpa batas
+    - kolom: Daftar kolom yang dibaca (yang tidak ada dilewati), None berarti semua
+    - saring: Dict kolom -> daftar nilai yang dipertahankan
+    - bagian: Folder partisi dari ringkasan `siapkan_partisi`; None
+      berarti folder yang tercatat di meta.json saat ini
+
+    Returns:
+    - DataFrame transaksi, urut per bulan lalu per urutan di CSV
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    folder = folder_cache(path)
+    if bagian is None:
+        bagian = baca_meta(folder)["ringkasan"]["bagian"]
+    dataset = ds.dataset(
+        os.path.join(folder, bagian),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([(KOLOM_PARTISI, pa.string())]), flavor="hive"),
+    )
+
+    syarat = []
+    if awal is not None:
+        awal = pd.Timestamp(awal)
+        syarat += [
+            ds.field(KOLOM_PARTISI) >= f"{awal:%Y-%m}",
+            ds.field("date") >= pa.scalar(awal.to_datetime64()),
+        ]
+    if akhir is not None:
+        akhir = pd.Timestamp(akhir)
+        syarat += [
+            ds.field(KOLOM_PARTISI) <= f"{akhir:%Y-%m}",
+            ds.field("date") < pa.scalar((akhir + pd.Timedelta(days=1)).to_datetime64()),
+        ]
+    for nama, nilai in (saring or {}).items():
+        syarat.append(ds.field(nama).isin(list(nilai)))
+
+    filter_ = None
+    for s in syarat:
+        filter_ = s if filter_ is None else filter_ & s
+
+    nama_kolom = [n for n in dataset.schema.names if n != KOLOM_PARTISI]
+    if kolom is not None:
+        nama_kolom = [n for n in nama_kolom if n in kolom]
+    return dataset.to_table(columns=nama_kolom, filter=filter_).to_pandas()
+
+
+def muat_transaksi(path=DATA_FILE):
+    """
+    Muat seluruh data transaksi bersih dari penyimpanan terpartisi
+
+    Parameters:
+    - path: Lokasi CSV transaksi
+
+    Returns:
+    - DataFrame transaksi yang sudah dibersihkan; sel uang tidak valid
+      dilaporkan di `df.attrs["sel_tidak_valid"]`
+    """
+    ringkasan = siapkan_partisi(path)
+    df = muat_rentang(path, bagian=ringkasan["bagian"])
+    df.attrs["sel_tidak_valid"] = ringkasan["sel_tidak_valid"]
+    hapus_partisi_lama(path, simpan={ringkasan["bagian"]})
+    return df
+
+
+def muat_harian(path=DATA_FILE, ukuran_potongan=UKURAN_POTONGAN):
+    """
+    Muat agregat harian transaksi dengan kolom yang siap dipakai dashboard
+
+    Ingesti bertahap hanya dijalankan bila CSV berubah sejak ingesti
+    terakhir. Setiap baris mewakili satu grup harian: `jumlah_transaksi`
+    berisi banyaknya transaksi, kolom uang dan `sales_qty` berisi jumlah,
+    `unit_price` dan `discount` berisi rata-rata per transaksi dalam grup,
+    dan `profit_margin` dihitung dari total profit dan revenue grup.
+
+    Parameters:
+    - path: Lokasi CSV transaksi
+    - ukuran_potongan: Jumlah baris per potongan saat ingesti
+
+    Returns:
+    - DataFrame agregat harian
+    """
+    meta, valid = kunci_cache(path)
+    harian = None
+    if valid and meta.get("versi_bertahap") == VERSI_BERTAHAP:
+        try:
+            harian = pd.read_parquet(os.path.join(folder_cache(path), "harian.parquet"))
+        except (OSError, ValueError):
+            pass
+    if harian is None:
+        harian, _ = ingest_bertahap(path, ukuran_potongan)
+
+    for kolom in ["unit_price", "discount"]:
+        if f"{kolom}_jumlah" in harian.columns:
+            harian[kolom] = harian.pop(f"{kolom}_jumlah") / harian.pop(f"{kolom}_n")
+    return tambah_kolom_turunan(harian)
+
+
+# =====================================================
+# PEMANTAU PERUBAHAN BERKAS
+# =====================================================
+class PemantauTransaksi:
+    """
+    Menyimpan hasil muat transaksi terbaru (DataFrame, atau ringkasan
+    penyimpanan terpartisi) dan membangunnya ulang di thread latar saat
+    CSV berubah
+
+    Perubahan dideteksi dari ukuran dan mtime CSV; data hanya dimuat ulang
+    bila hash isinya juga berbeda. Data baru dibangun sepenuhnya sebelum
+    ditukar dengan satu penugasan, sehingga pembaca selalu mendapat data
+    lama atau data baru yang lengkap, tidak pernah setengah jadi.
+    `setelah_tukar(lama, baru)` dipanggil setelah penukaran, mis. untuk
+    menghapus berkas versi lama yang tidak lagi dirujuk.
+    """
+
+    def __init__(self, path=DATA_FILE, muat=muat_transaksi, interval=2.0, setelah_tukar=None):
+        self.path = path
+        self.muat = muat
+        self.interval = interval
+        self.setelah_tukar = setelah_tukar
+        self.galat = None
+        self._data = None  # tuple (sha256, hasil muat)
+        self._tanda = None
+        self._kunci = threading.Lock()
+        self._berhenti = threading.Event()
+
+    def _muat_ulang(self):
+        tanda = tanda_berkas(self.path)
+        sha = hash_isi(self.path)
+        if self._data is not None and self._data[0] == sha:
+            # Hanya mtime yang berubah
+            self._tanda = tanda
+            return False
+
+        df = self.muat(self.path)
+        if self._data is not None and tanda_berkas(self.path) != tanda:
+            # CSV berubah lagi selama dimuat (mungkin masih ditulis): ulangi nanti
+            return False
+
+        lama = None if self._data is None else self._data[1]
+        self._data = (sha, df)
+        self._tanda = tanda
+        if self.setelah_tukar is not None:
+            self.setelah_tukar(lama, df)
+        return True
+
+    def data(self):
+        """
+        Hasil muat terbaru; pemuatan pertama dilakukan langsung bila belum ada
+
+        Returns:
+        - Hasil `muat` (dibagi antar pembaca, jangan diubah di tempat)
+        """
+        if self._data is None:
+            with self._kunci:
+                if self._data is None:
+                    self._muat_ulang()
+        return self._data[1]
+
+    @property
+    def sha256(self):
+        return None if self._data is None else self._data[0]
+
+    def periksa(self):
+        """
+        Muat ulang bila CSV berubah sejak pemuatan terakhir
+
+        Kegagalan (mis. CSV rusak) disimpan di `galat` dan data lama tetap
+        dilayani sampai CSV berubah lagi.
+
+        Returns:
+        - True bila data baru sudah ditukar masuk
+        """
+        tanda = tanda_berkas(self.path)
+        if tanda is None or tanda == self._tanda:
+            return False
+
+        with self._kunci:
+            try:
+                berubah = self._muat_ulang()
+            except Exception as e:
+                self.galat = e
+                self._tanda = tanda
+                return False
+            self.galat = None
+            return berubah
+
+    def _jalan(self):
+        while not self._berhenti.wait(self.interval):
+            self.periksa()
+
+    def mulai(self):
+        """
+        Jalankan thread latar yang memeriksa CSV setiap `interval` detik
+        """
+        threading.Thread(target=self._jalan, name="pemantau-transaksi", daemon=True).start()
+        return self
+
+    def berhenti(self):
+        self._berhenti.set()